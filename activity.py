@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Inactivity alerts
+
+A storage listener records the day each user last saved a journal or mood
+entry, so finding inactive users never reads anyone's history. The system
+namespace keeps two stores:
+
+- "last_activity": user id -> {"day": last active day, "index": key below}
+- "inactivity_index": "<day>:<user>" -> user id, where day is the later of
+  the user's last activity and last alert
+
+Index keys sort by day, so the users due for an alert are exactly the keys
+before "<cutoff day>:", found with one range query. Alerting a user moves
+their key to today, so they are alerted again only after another
+INACTIVITY_DAYS without activity. Each check costs O(1) per user alerted,
+whatever the total number of users.
+
+Users whose data predates the index are added with:
+
+    python activity.py rebuild
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import threading
+
+import notifications
+from scheduler import scheduler
+from storage import SYSTEM_USER, get_storage, list_users, subscribe
+
+ACTIVITY_STORE = "last_activity"
+INDEX_STORE = "inactivity_index"
+
+# Saves to these stores count as activity
+ACTIVITY_STORES = ("journal_entries", "mood_entries")
+
+INACTIVITY_DAYS = int(os.environ.get("MHC_INACTIVITY_DAYS", "3"))
+
+# Seconds between checks for inactive users
+CHECK_INTERVAL = 3600
+
+_started = threading.Event()
+
+
+def system_storage():
+    return get_storage(SYSTEM_USER)
+
+
+def record_activity(user_id, day):
+    """Note that the user was active on day ("%Y-%m-%d")"""
+    storage = system_storage()
+    last = storage.get(ACTIVITY_STORE, user_id)
+    if last is not None and last["day"] >= day:
+        return
+    index_key = f"{day}:{user_id}"
+    if last is not None:
+        storage.delete(INDEX_STORE, last["index"])
+    storage.put(INDEX_STORE, index_key, user_id)
+    storage.put(ACTIVITY_STORE, user_id, {"day": day, "index": index_key})
+
+
+def last_active(user_id):
+    """Return the last day the user saved an entry, or None if unknown"""
+    last = system_storage().get(ACTIVITY_STORE, user_id)
+    return last["day"] if last else None
+
+
+@subscribe
+def _on_change(storage, store, key, old, new, before, after):
+    # Only entries dated today are activity; backfills and imports of old entries are not
+    if store not in ACTIVITY_STORES or new is None or storage.user_id in (None, SYSTEM_USER):
+        return
+    today = datetime.date.today().isoformat()
+    if key.startswith(today):
+        record_activity(storage.user_id, today)
+
+
+def check_inactive(today=None):
+    """Alert every user inactive for INACTIVITY_DAYS since their last activity or alert; return their ids"""
+    today = today or datetime.date.today()
+    cutoff = (today - datetime.timedelta(days=INACTIVITY_DAYS)).isoformat()
+    storage = system_storage()
+    alerted = []
+    for index_key, user_id in storage.query(INDEX_STORE, end=f"{cutoff}:"):
+        last = storage.get(ACTIVITY_STORE, user_id)
+        if last is None or last["index"] != index_key:
+            storage.delete(INDEX_STORE, index_key)  # Left behind by an interrupted update
+            continue
+        days = (today - datetime.date.fromisoformat(last["day"])).days
+        notifications.notify(user_id, "inactivity", "We miss you",
+                             f"You haven't checked in for {days} days. How are you feeling today?",
+                             key="inactivity")
+        moved = f"{today.isoformat()}:{user_id}"
+        storage.delete(INDEX_STORE, index_key)
+        storage.put(INDEX_STORE, moved, user_id)
+        storage.put(ACTIVITY_STORE, user_id, dict(last, index=moved))
+        alerted.append(user_id)
+    return alerted
+
+
+def rebuild():
+    """Index the latest journal or mood entry of every user; return the number of users indexed
+
+    Walks every user's data directory, so it is meant for a one-off run.
+    """
+    indexed = 0
+    for user_id in list_users():
+        storage = get_storage(user_id)
+        days = [latest[0][0][:10] for latest in (storage.latest(store, 1) for store in ACTIVITY_STORES) if latest]
+        if days:
+            record_activity(user_id, max(days))
+            indexed += 1
+    return indexed
+
+
+def start():
+    """Check for inactive users every CHECK_INTERVAL seconds on the background scheduler; safe to call repeatedly"""
+    if _started.is_set():
+        return
+    _started.set()
+    scheduler.start()
+    scheduler.every("inactivity", CHECK_INTERVAL, check_inactive, first_run=0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inactivity alerts for Mental Health Companion Bot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="index the last activity of users with existing data")
+    commands.add_parser("check", help="alert inactive users now")
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild":
+        print(f"Indexed the last activity of {rebuild()} users")
+    else:
+        alerted = check_inactive()
+        notifications.dispatcher.flush()
+        print(f"Alerted {len(alerted)} inactive users")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
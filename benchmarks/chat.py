@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Chat latency benchmark for Mental Health Companion Bot
+
+Runs the chat client against the local mock server and reports time to first
+token, time to the full reply and throughput, with a fresh connection per
+request (as the page used to make) and with the pooled session.
+
+Usage: python benchmarks/chat.py [--requests N] [--clients N]
+                                 [--first-token-delay S] [--token-delay S]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from chat_client import OpenAIBackend  # noqa: E402
+from http_client import new_session  # noqa: E402
+from mock_openai import start_server  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "I have been feeling anxious lately."}]
+
+
+def run_client(backend_factory, count, results):
+    for _ in range(count):
+        backend = backend_factory()
+        start = time.perf_counter()
+        first = None
+        tokens = 0
+        for _ in backend.stream(MESSAGES):
+            if first is None:
+                first = time.perf_counter() - start
+            tokens += 1
+        results.append((first, time.perf_counter() - start, tokens))
+
+
+def measure(backend_factory, requests_per_client, clients):
+    results = []
+    threads = [
+        threading.Thread(target=run_client, args=(backend_factory, requests_per_client, results))
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    ttft = sorted(first for first, _, _ in results)
+    total = sorted(elapsed for _, elapsed, _ in results)
+    return {
+        "ttft_p50": statistics.median(ttft) * 1000,
+        "ttft_p95": ttft[int(0.95 * (len(ttft) - 1))] * 1000,
+        "reply_p50": statistics.median(total) * 1000,
+        "requests_per_second": len(results) / wall,
+        "tokens_per_second": sum(tokens for _, _, tokens in results) / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20, help="requests per client (default: %(default)s)")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent clients (default: %(default)s)")
+    parser.add_argument("--first-token-delay", type=float, default=0.2, help="seconds (default: %(default)s)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds (default: %(default)s)")
+    args = parser.parse_args()
+
+    server, base_url = start_server(first_token_delay=args.first_token_delay, token_delay=args.token_delay)
+    pooled = new_session(retry_post=True)
+    modes = [
+        ("fresh connection", lambda: OpenAIBackend("mock", base_url=base_url, session=new_session(retry_post=True))),
+        ("pooled session", lambda: OpenAIBackend("mock", base_url=base_url, session=pooled)),
+    ]
+
+    print(f"{args.clients} clients x {args.requests} requests, "
+          f"first token after {args.first_token_delay * 1000:.0f} ms, {args.token_delay * 1000:.0f} ms per token")
+    print(f"{'Mode':<18} {'TTFT p50':>9} {'TTFT p95':>9} {'reply p50':>10} {'req/s':>7} {'tok/s':>8}")
+    print("-" * 66)
+    for label, factory in modes:
+        result = measure(factory, args.requests, args.clients)
+        print(f"{label:<18} {result['ttft_p50']:>9.1f} {result['ttft_p95']:>9.1f} {result['reply_p50']:>10.1f} "
+              f"{result['requests_per_second']:>7.1f} {result['tokens_per_second']:>8.0f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Export benchmark for Mental Health Companion Bot
+
+Fills a temporary data directory with a synthetic history, then exports it in
+each format and compression and reports throughput, output size and peak
+Python memory, next to the old export (one json.dumps of every entry).
+
+Usage: python benchmarks/export.py [--entries N] [--backend jsonl|sqlite]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mood_data import MOOD_OPTIONS, MOOD_SCORES  # noqa: E402
+
+NOTES = ["Slept well.", "Long day at work, feeling drained.", "Went for a walk in the park.", ""]
+
+
+class CountingFile:
+    """Write target that only counts bytes"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+def fill(storage, entries):
+    rng = random.Random(0)
+    start = datetime.datetime(2000, 1, 1)
+    moods = {}
+    for i in range(entries):
+        key = (start + datetime.timedelta(hours=3 * i)).strftime("%Y-%m-%d %H:%M")
+        mood = rng.choice(MOOD_OPTIONS)
+        score = max(-1.0, min(1.0, MOOD_SCORES[mood] + rng.uniform(-0.25, 0.25)))
+        moods[key] = {"mood": mood, "notes": rng.choice(NOTES), "sentiment_score": round(score, 3)}
+    storage.replace("mood_entries", moods)
+    journal = {
+        (start + datetime.timedelta(days=i)).strftime("%Y-%m-%d"): " ".join(rng.choices(NOTES, k=20))
+        for i in range(entries // 8)
+    }
+    storage.replace("journal_entries", journal)
+    return len(moods) + len(journal)
+
+
+def old_export(storage, out):
+    from storage import json_default
+    data = {"journal_entries": storage.load("journal_entries"), "mood_entries": storage.load("mood_entries")}
+    out.write(json.dumps(data, default=json_default).encode("utf-8"))
+
+
+def measure(run):
+    out = CountingFile()
+    start = time.perf_counter()
+    run(out)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run(CountingFile())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, out.size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200000, help="mood entries (default: %(default)s)")
+    parser.add_argument("--backend", choices=["jsonl", "sqlite"], default="jsonl")
+    args = parser.parse_args()
+
+    # Storage reads its settings on import
+    os.environ["MHC_DATA_DIR"] = tempfile.mkdtemp(prefix="mhc-export-")
+    os.environ["MHC_STORAGE"] = args.backend
+    import export
+    from storage import get_storage
+
+    storage = get_storage()
+    total = fill(storage, args.entries)
+    storage.flush()
+
+    modes = [("old json.dumps", lambda out: old_export(storage, out))]
+    for fmt in export.FORMATS:
+        for compression in export.available_compressions():
+            modes.append((f"{fmt} {compression}", lambda out, fmt=fmt, compression=compression:
+                          export.write_export(storage, out, fmt=fmt, compression=compression)))
+
+    print(f"{total} entries, {args.backend} backend")
+    print(f"{'Mode':<16} {'seconds':>8} {'entries/s':>10} {'output MB':>10} {'peak MB':>8}")
+    print("-" * 56)
+    for label, run in modes:
+        elapsed, size, peak = measure(run)
+        print(f"{label:<16} {elapsed:>8.2f} {total / elapsed:>10.0f} {size / 1e6:>10.1f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Local mock of the OpenAI chat completions endpoint
+
+Streams a canned reply as server-sent events with a configurable delay before
+the first token and between tokens, over keep-alive HTTP/1.1 connections. Use
+it to measure the chat client offline, or point the app at it:
+
+    python benchmarks/mock_openai.py --port 8765
+    MHC_OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+
+Any API key is accepted.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = (
+    "It sounds like you have a lot on your mind. Taking a few slow breaths can help "
+    "you feel a little more grounded. Would you like to talk about what is worrying you, "
+    "or try a short breathing exercise together?"
+)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Set by make_server
+    first_token_delay = 0.0
+    token_delay = 0.0
+    reply = REPLY
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            request = {}
+
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+        if not request.get("messages"):
+            self._send_json(400, {"error": {"message": "messages is required"}})
+            return
+
+        time.sleep(self.first_token_delay)
+        tokens = [word + " " for word in self.reply.split(" ")]
+        tokens[-1] = tokens[-1].rstrip()
+
+        if not request.get("stream"):
+            message = {"role": "assistant", "content": "".join(tokens)}
+            self._send_json(200, {"choices": [{"index": 0, "message": message, "finish_reason": "stop"}]})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, token in enumerate(tokens):
+            if index:
+                time.sleep(self.token_delay)
+            chunk = {"choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+            self._send_chunk(f"data: {json.dumps(chunk)}\n\n")
+        self._send_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping idle keep-alive connections is expected
+        pass
+
+
+def make_server(host="127.0.0.1", port=0, first_token_delay=0.2, token_delay=0.01, reply=REPLY):
+    """Return a mock server (not yet serving); port 0 picks a free port"""
+    handler = type("Handler", (MockHandler,), {
+        "first_token_delay": first_token_delay,
+        "token_delay": token_delay,
+        "reply": reply,
+    })
+    return MockServer((host, port), handler)
+
+
+def start_server(**options):
+    """Serve in a background thread and return (server, base_url)"""
+    server = make_server(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-token-delay", type=float, default=0.2, help="seconds (default: %(default)s)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds (default: %(default)s)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.first_token_delay, args.token_delay)
+    print(f"Mock chat completions at http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
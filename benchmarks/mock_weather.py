@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Local stub of the OpenWeatherMap current weather and icon endpoints
+
+Answers every city with a fixed observation after an optional delay, so the
+Weather & Mood page can be exercised offline:
+
+    python benchmarks/mock_weather.py --port 8766
+    MHC_WEATHER_BASE_URL=http://127.0.0.1:8766/data/2.5 \\
+    MHC_WEATHER_ICON_URL=http://127.0.0.1:8766/img/wn streamlit run app.py
+
+Any API key is accepted, except "invalid" (answered with a 401) and
+"malformed" (answered with a 200 whose observation lacks its fields).
+"""
+
+import argparse
+import json
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _png(width=4, height=4, rgb=(135, 206, 235)):
+    """A tiny solid-colour PNG"""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\x00" + bytes(rgb) * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+ICON = _png()
+
+
+class WeatherHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Set by make_server
+    delay = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        time.sleep(self.delay)
+        if url.path.endswith("/weather"):
+            self.server.weather_requests += 1
+            query = parse_qs(url.query)
+            if query.get("appid", [""])[0] == "invalid":
+                self._send(401, "application/json", json.dumps({"cod": 401, "message": "Invalid API key."}))
+                return
+            if query.get("appid", [""])[0] == "malformed":
+                self._send(200, "application/json", json.dumps({"name": "Nowhere", "main": {}, "weather": []}))
+                return
+            city = query.get("q", ["London"])[0]
+            self._send(200, "application/json", json.dumps({
+                "name": city.title(),
+                "main": {"temp": 18.5, "feels_like": 17.9, "humidity": 64},
+                "weather": [{"main": "Clouds", "description": "scattered clouds", "icon": "03d"}],
+            }))
+        elif url.path.endswith("@2x.png"):
+            self._send(200, "image/png", ICON)
+        else:
+            self._send(404, "application/json", json.dumps({"cod": 404, "message": "Not found"}))
+
+    def _send(self, status, content_type, body):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    # Weather lookups answered, for tests
+    weather_requests = 0
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+def make_server(host="127.0.0.1", port=0, delay=0.0):
+    """Return a stub server (not yet serving); port 0 picks a free port"""
+    handler = type("Handler", (WeatherHandler,), {"delay": delay})
+    return StubServer((host, port), handler)
+
+
+def start_server(**options):
+    """Serve in a background thread and return (server, weather base URL, icon base URL)"""
+    server = make_server(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}/data/2.5", f"http://{host}:{port}/img/wn"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds per request (default: %(default)s)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.delay)
+    print(f"Stub weather API at http://{args.host}:{args.port}/data/2.5")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
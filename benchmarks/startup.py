@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for Mental Health Companion Bot
+
+Measures, in a fresh interpreter per run, how long it takes to import the
+handler of each page together with the modules app.py itself imports on
+every run (on top of Streamlit), and compares it with the set of libraries
+app.py used to import eagerly for every page.
+
+Usage: python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from views import PAGES  # noqa: E402
+
+# What every page paid for before the handlers were split into views/
+EAGER_IMPORTS = [
+    "pandas", "matplotlib.pyplot", "numpy", "requests", "PIL.Image",
+    "speech_recognition", "pyttsx3", "openai", "textblob",
+]
+
+def app_imports():
+    """Top-level modules app.py imports besides Streamlit, read from its source"""
+    with open(os.path.join(ROOT, "app.py")) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules.append(node.module)
+    return [module for module in modules if module.split(".")[0] not in ("streamlit", "importlib")]
+
+
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+import streamlit
+base = time.perf_counter()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+end = time.perf_counter()
+print(json.dumps({"streamlit": base - start, "page": end - base}))
+"""
+
+
+def measure(modules, runs):
+    """Return the median import times in ms, or an error message"""
+    streamlit_times, page_times = [], []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE] + modules,
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None, result.stderr.strip().splitlines()[-1]
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        streamlit_times.append(timings["streamlit"] * 1000)
+        page_times.append(timings["page"] * 1000)
+    return (statistics.median(streamlit_times), statistics.median(page_times)), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per page (default: %(default)s)")
+    args = parser.parse_args()
+
+    base = app_imports()
+    rows = [("(eager imports, before)", EAGER_IMPORTS), ("(app.py imports only)", base)]
+    rows += [(page, base + [module]) for page, module in PAGES.items()]
+
+    print(f"{'Page':<26} {'streamlit ms':>13} {'page ms':>10}")
+    print("-" * 51)
+    for label, modules in rows:
+        timings, error = measure(modules, args.runs)
+        if error:
+            print(f"{label:<26} {'error: ' + error}")
+        else:
+            print(f"{label:<26} {timings[0]:>13.1f} {timings[1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
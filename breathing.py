@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Breathing exercise engine
+
+Techniques are loaded from breathing_techniques.json (or the file named by
+MHC_BREATHING_TECHNIQUES), validated once, and compiled into a timeline of
+phases and per-second frames. The timeline is turned into a single HTML
+snippet whose CSS keyframes animate the circle, the countdown, the status text
+and the progress bar in the browser, so starting an exercise is a single
+lookup and render on the server and no script thread sleeps while the user
+breathes.
+
+Run `python breathing.py [FILE]` to check a techniques file.
+"""
+
+import json
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+TECHNIQUES_FILE = os.environ.get(
+    "MHC_BREATHING_TECHNIQUES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "breathing_techniques.json"),
+)
+
+# Phases of a cycle in order: label, circle colour and circle size (start, end)
+PHASE_STYLES = {
+    "inhale": ("Inhale deeply...", "skyblue", 50, 90),
+    "hold1": ("Hold your breath...", "lightgreen", 90, 90),
+    "exhale": ("Exhale slowly...", "lavender", 90, 50),
+    "hold2": ("Hold your breath...", "lightpink", 50, 50),
+}
+
+# Phases that may be skipped with a duration of 0
+OPTIONAL_PHASES = ("hold1", "hold2")
+
+MAX_CYCLES = 20
+MAX_PHASE_SECONDS = 60
+
+COMPLETE_LABEL = "Breathing exercise complete!"
+
+# Height of the component iframe in pixels
+ANIMATION_HEIGHT = 200
+
+Phase = namedtuple("Phase", ["name", "label", "color", "start", "seconds", "size_from", "size_to"])
+
+# What is shown during one second of the exercise
+Frame = namedtuple("Frame", ["start", "label", "count"])
+
+Technique = namedtuple("Technique", ["name", "schedule", "frames", "duration", "html"])
+
+
+# Registry
+
+def validate_technique(name, params):
+    """Raise ValueError unless params describe a usable technique"""
+    if not isinstance(params, dict):
+        raise ValueError(f"{name}: expected an object of phase durations")
+    unknown = set(params) - set(PHASE_STYLES) - {"cycles"}
+    if unknown:
+        raise ValueError(f"{name}: unknown fields {', '.join(sorted(unknown))}")
+    for field in list(PHASE_STYLES) + ["cycles"]:
+        value = params.get(field)
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"{name}: {field} must be a whole number of seconds")
+        low = 0 if field in OPTIONAL_PHASES else 1
+        high = MAX_CYCLES if field == "cycles" else MAX_PHASE_SECONDS
+        if not low <= value <= high:
+            raise ValueError(f"{name}: {field} must be between {low} and {high}")
+
+
+def compile_technique(name, params):
+    schedule = build_schedule(
+        params["inhale"], params["hold1"], params["exhale"], params["hold2"], params["cycles"]
+    )
+    frames = build_frames(schedule)
+    return Technique(name, schedule, frames, total_duration(schedule), compile_animation(schedule, frames))
+
+
+def load_techniques(path=TECHNIQUES_FILE):
+    """Load, validate and compile every technique of a file, keeping the file's order"""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            raw = json.load(file)
+    except (OSError, json.JSONDecodeError) as error:
+        raise ValueError(f"Could not read breathing techniques from {path}: {error}") from error
+    if not isinstance(raw, dict) or not raw:
+        raise ValueError(f"{path}: expected an object mapping technique names to their phases")
+
+    techniques = {}
+    for name, params in raw.items():
+        validate_technique(name, params)
+        techniques[name] = compile_technique(name, params)
+    return techniques
+
+
+@lru_cache(maxsize=None)
+def get_techniques(path=TECHNIQUES_FILE):
+    """Return the compiled registry, loading it on first use"""
+    return load_techniques(path)
+
+
+# Timeline
+
+@lru_cache(maxsize=32)
+def build_schedule(inhale, hold1, exhale, hold2, cycles):
+    """Return every phase of the exercise in order, skipping zero-length holds"""
+    durations = {"inhale": inhale, "hold1": hold1, "exhale": exhale, "hold2": hold2}
+    schedule = []
+    start = 0
+    for _ in range(cycles):
+        for name, seconds in durations.items():
+            if seconds <= 0:
+                continue
+            label, color, size_from, size_to = PHASE_STYLES[name]
+            schedule.append(Phase(name, label, color, start, seconds, size_from, size_to))
+            start += seconds
+    return tuple(schedule)
+
+
+def build_frames(schedule):
+    """Return one frame per second of the exercise, plus the final one"""
+    frames = [
+        Frame(phase.start + second, phase.label, str(phase.seconds - second))
+        for phase in schedule
+        for second in range(phase.seconds)
+    ]
+    frames.append(Frame(total_duration(schedule), COMPLETE_LABEL, ""))
+    return tuple(frames)
+
+
+def total_duration(schedule):
+    last = schedule[-1]
+    return last.start + last.seconds
+
+
+# Rendering
+
+def _pct(seconds, total):
+    return f"{100 * seconds / total:.4f}%"
+
+
+def _hold_keyframes(name, steps, total):
+    """Keyframes for a discrete property, holding each value for its whole interval
+
+    steps is a list of (start, end, css) tuples in seconds.
+    """
+    frames = []
+    for start, end, css in steps:
+        frames.append(f"{_pct(start, total)}{{{css}}}")
+        frames.append(f"{_pct(max(start, end - 0.01), total)}{{{css}}}")
+    return f"@keyframes {name}{{{''.join(frames)}}}"
+
+
+def _frame_steps(frames, field):
+    """Merge consecutive frames showing the same value into (start, end, css) steps"""
+    steps = []
+    for frame, following in zip(frames, frames[1:] + (None,)):
+        value = getattr(frame, field)
+        end = following.start if following else frame.start
+        if steps and steps[-1][2] == f'content:"{value}"' and steps[-1][1] == frame.start:
+            steps[-1] = (steps[-1][0], end, steps[-1][2])
+        else:
+            steps.append((frame.start, end, f'content:"{value}"'))
+    return steps
+
+
+@lru_cache(maxsize=32)
+def compile_animation(schedule, frames):
+    """Return the self-contained HTML/CSS animation for a schedule and its frames (see build_frames)"""
+    total = total_duration(schedule)
+
+    circle = []
+    for phase in schedule:
+        end = phase.start + phase.seconds
+        circle.append(
+            f"{_pct(phase.start, total)}{{width:{phase.size_from}px;height:{phase.size_from}px;"
+            f"background-color:{phase.color}}}"
+        )
+        circle.append(
+            f"{_pct(max(phase.start, end - 0.01), total)}{{width:{phase.size_to}px;"
+            f"height:{phase.size_to}px;background-color:{phase.color}}}"
+        )
+
+    return f"""
+<style>
+body {{ margin: 0; font-family: "Source Sans Pro", sans-serif; }}
+.wrap {{ display: flex; flex-direction: column; align-items: center; gap: 12px; }}
+.bar {{ width: 100%; height: 8px; background: #f0f2f6; border-radius: 4px; overflow: hidden; }}
+.bar div {{ height: 100%; width: 0; background: #ff4b4b; animation: progress {total}s linear forwards; }}
+.status::after {{ content: ""; animation: status {total}s linear forwards; }}
+.stage {{ height: 100px; display: flex; align-items: center; justify-content: center; }}
+.circle {{
+    border-radius: 50%; display: flex; align-items: center; justify-content: center;
+    font-size: 20px; color: white; animation: circle {total}s linear forwards;
+}}
+.circle::after {{ content: ""; animation: count {total}s linear forwards; }}
+@keyframes progress {{ from {{ width: 0; }} to {{ width: 100%; }} }}
+@keyframes circle {{{''.join(circle)}}}
+{_hold_keyframes("status", _frame_steps(frames, "label"), total)}
+{_hold_keyframes("count", _frame_steps(frames, "count"), total)}
+</style>
+<div class="wrap">
+    <div class="bar"><div></div></div>
+    <div class="status"></div>
+    <div class="stage"><div class="circle"></div></div>
+</div>
+"""
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else TECHNIQUES_FILE
+    try:
+        techniques = load_techniques(path)
+    except ValueError as error:
+        print(f"✗ {error}")
+        return 1
+    for technique in techniques.values():
+        minutes, seconds = divmod(technique.duration, 60)
+        print(f"✓ {technique.name}: {len(technique.schedule)} phases, {minutes} min {seconds} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Small thread-safe caches shared by every session of the app process
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry, with optional expiry"""
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                value, expires = item
+                if expires is None or expires > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+            return default if item is None else item[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+class EngineCache:
+    """Per-user objects derived from one store, kept current by applying each write as a delta
+
+    build(entries, version) makes an engine from the (key, value) pairs of the
+    store; engines have a `version` attribute and an apply(key, old, new)
+    method. Register on_change with storage.subscribe().
+    """
+
+    def __init__(self, store, build, maxsize=1024):
+        self.store = store
+        self.build = build
+        self._engines = LRUCache(maxsize=maxsize)
+
+    def get(self, storage):
+        """Return the engine of the storage's user, rebuilding it only if out of date"""
+        version = storage.version(self.store)
+        engine = self._engines.get(storage.user_id)
+        if engine is None or engine.version != version:
+            engine = self.build(storage.query(self.store), version)
+            # A write between reading the version and the entries would be applied twice by on_change
+            if storage.version(self.store) == version:
+                self._engines.set(storage.user_id, engine)
+        return engine
+
+    def on_change(self, storage, store, key, old, new, before, after):
+        if store != self.store:
+            return
+        engine = self._engines.get(storage.user_id)
+        if engine is None:
+            return
+        if key is None or engine.version != before:
+            # The whole store was replaced, or the engine is not at the version this
+            # change applies to (it missed a write or already read this one); rebuild on next access
+            self._engines.pop(storage.user_id)
+            return
+        engine.apply(key, old, new)
+        engine.version = after
@@ -0,0 +1,158 @@
+"""
+Chat completion backends for Chat Support
+
+Replies are streamed token by token over a pooled HTTP session, so the page
+can show the reply as it is generated and consecutive requests reuse the same
+connection. Failed requests are retried with backoff before anything is
+streamed; every request is bounded by a connect timeout and a timeout between
+streamed chunks.
+
+Set MHC_OPENAI_BASE_URL to talk to another OpenAI compatible endpoint, for
+example the mock server in benchmarks/mock_openai.py.
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+import requests
+
+from http_client import get_session
+
+OPENAI_BASE_URL = os.environ.get("MHC_OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+CHAT_MODEL = "gpt-3.5-turbo"
+
+CONNECT_TIMEOUT = 5
+# Longest wait for the next streamed chunk
+READ_TIMEOUT = 30
+
+
+class ChatError(Exception):
+    """A chat request failed; the message is safe to show to the user"""
+
+
+class ChatStats:
+    """Latency of recent chat requests; time to first token is the headline number"""
+
+    def __init__(self, window=200):
+        self.requests = 0
+        self.errors = 0
+        self._ttft = deque(maxlen=window)
+        self._rates = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, ttft, elapsed, tokens):
+        with self._lock:
+            self.requests += 1
+            if ttft is not None:
+                self._ttft.append(ttft)
+            if tokens and elapsed > 0:
+                self._rates.append(tokens / elapsed)
+
+    def record_error(self):
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+
+    def summary(self):
+        with self._lock:
+            ttft = sorted(self._ttft)
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "ttft_p50": statistics.median(ttft) if ttft else None,
+                "ttft_p95": ttft[int(0.95 * (len(ttft) - 1))] if ttft else None,
+                "tokens_per_second": statistics.median(self._rates) if self._rates else None,
+            }
+
+
+stats = ChatStats()
+
+
+def chat_stats():
+    return stats.summary()
+
+
+class ChatBackend:
+    """Interface of a chat completion backend"""
+
+    def stream(self, messages):
+        """Yield the reply to messages piece by piece"""
+        raise NotImplementedError
+
+    def complete(self, messages):
+        return "".join(self.stream(messages))
+
+
+class OpenAIBackend(ChatBackend):
+    """Streaming client for the OpenAI chat completions API"""
+
+    def __init__(self, api_key, model=CHAT_MODEL, base_url=None, session=None,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        self.api_key = api_key
+        self.model = model
+        self.url = (base_url or OPENAI_BASE_URL).rstrip("/") + "/chat/completions"
+        self.session = session
+        self.timeout = timeout
+
+    def stream(self, messages):
+        # Completions are safe to resend, so POSTs are retried as well
+        session = self.session or get_session("chat", retry_post=True)
+        start = time.perf_counter()
+        try:
+            response = session.post(
+                self.url,
+                json={"model": self.model, "messages": messages, "stream": True},
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                stream=True,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as error:
+            stats.record_error()
+            raise ChatError(f"Could not reach the chat service: {error}") from error
+
+        with response:
+            if response.status_code != 200:
+                stats.record_error()
+                raise ChatError(_error_message(response))
+
+            ttft = None
+            tokens = 0
+            try:
+                for content in _sse_contents(response):
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    tokens += 1
+                    yield content
+            except (requests.RequestException, ValueError) as error:
+                stats.record_error()
+                raise ChatError(f"The chat reply was interrupted: {error}") from error
+
+        stats.record(ttft, time.perf_counter() - start, tokens)
+
+
+def _sse_contents(response):
+    """Yield the text deltas of a server-sent event stream of completion chunks"""
+    response.encoding = "utf-8"
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        choices = json.loads(data).get("choices") or [{}]
+        content = choices[0].get("delta", {}).get("content")
+        if content:
+            yield content
+
+
+def _error_message(response):
+    try:
+        message = response.json()["error"]["message"]
+    except (ValueError, KeyError, TypeError):
+        message = response.reason or "unknown error"
+    return f"The chat service returned {response.status_code}: {message}"
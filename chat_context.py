@@ -0,0 +1,100 @@
+"""
+Bounded context window for Chat Support
+
+Only the most recent turns that fit in a token budget are sent to the model.
+Turns that fall out of the window are folded, once, into a short running
+summary that is sent in their place, so the size of each request stays flat
+however long the conversation gets. Token counts are estimated once per
+message and kept alongside the history.
+"""
+
+import re
+
+# Token budget of a request, leaving room for the reply within the model's limit
+CONTEXT_TOKENS = 3000
+SUMMARY_TOKENS = 400
+
+# Words of an earlier message kept in the summary
+SUMMARY_WORDS = 25
+
+# Per-message overhead of the chat format
+MESSAGE_OVERHEAD = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token for English text)"""
+    return MESSAGE_OVERHEAD + (len(text) + 3) // 4
+
+
+def summary_line(message):
+    """Condense an earlier user message to its first sentence"""
+    sentence = _SENTENCE_END.split(message["content"].strip(), 1)[0]
+    words = sentence.split()
+    if len(words) > SUMMARY_WORDS:
+        sentence = " ".join(words[:SUMMARY_WORDS]) + "..."
+    return f"- The user said: {sentence}"
+
+
+class ContextWindow:
+    """Sliding window over a conversation with a running summary of older turns"""
+
+    def __init__(self, budget=CONTEXT_TOKENS, summary_budget=SUMMARY_TOKENS):
+        self.budget = budget
+        self.summary_budget = summary_budget
+        self.summarized = 0  # history[:summarized] is covered by the summary
+        self.summary_lines = []
+        self.summary_tokens = 0
+        self._tokens = []
+
+    def reset(self):
+        self.summarized = 0
+        self.summary_lines = []
+        self.summary_tokens = 0
+        self._tokens = []
+
+    def build(self, system_message, history):
+        """Return the messages to send for history, updating the summary as turns fall out"""
+        if len(history) < len(self._tokens):
+            # The conversation was cleared or replaced
+            self.reset()
+        for message in history[len(self._tokens):]:
+            self._tokens.append(estimate_tokens(message["content"]))
+
+        available = self.budget - estimate_tokens(system_message["content"]) - self.summary_budget
+        start = len(history)
+        used = 0
+        while start > self.summarized and (start == len(history) or used + self._tokens[start - 1] <= available):
+            start -= 1
+            used += self._tokens[start]
+
+        self._fold(history[self.summarized:start])
+        self.summarized = start
+
+        messages = [system_message]
+        if self.summary_lines:
+            summary = "\n".join([SUMMARY_PREFIX] + self.summary_lines)
+            messages.append({"role": "system", "content": summary})
+        return messages + list(history[start:])
+
+    def _fold(self, messages):
+        """Add turns leaving the window to the summary, dropping its oldest lines to stay in budget"""
+        for message in messages:
+            if message["role"] != "user":
+                continue
+            line = summary_line(message)
+            self.summary_lines.append(line)
+            self.summary_tokens += estimate_tokens(line)
+        while self.summary_tokens > self.summary_budget and self.summary_lines:
+            self.summary_tokens -= estimate_tokens(self.summary_lines.pop(0))
+
+    def stats(self):
+        return {
+            "messages": len(self._tokens),
+            "summarized": self.summarized,
+            "window_tokens": sum(self._tokens[self.summarized:]),
+            "summary_tokens": self.summary_tokens,
+        }
@@ -0,0 +1,78 @@
+"""
+Persistent Chat Support transcripts
+
+Each conversation has an entry in the conversation index holding its title
+and message count, and each message is stored under "<conversation id>:<time>"
+with the time to the microsecond and a random suffix, so the messages of a
+conversation are a contiguous key range and a page of recent messages is a
+single range query. No counter is read and written back, so sessions sharing
+a conversation can append to it at the same time; the count in the index is
+recounted from the key range. (Older transcripts used a zero-padded sequence
+number, which sorts before every time.)
+"""
+
+import secrets
+from datetime import datetime
+
+CONVERSATIONS_STORE = "chat_conversations"
+MESSAGES_STORE = "chat_messages"
+
+# Key separator; ";" sorts right after ":", which closes a conversation's range
+SEPARATOR = ":"
+RANGE_END = ";"
+
+TITLE_LENGTH = 40
+
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def message_key(conv_id, when):
+    return f"{conv_id}{SEPARATOR}{when:%Y%m%d%H%M%S%f}-{secrets.token_hex(3)}"
+
+
+def new_conversation(storage):
+    """Create an empty conversation and return its id"""
+    now = datetime.now()
+    conv_id = f"{now:%Y%m%d%H%M%S}-{secrets.token_hex(2)}"
+    storage.put(CONVERSATIONS_STORE, conv_id, {
+        "title": "New conversation",
+        "created": now.strftime(DATE_FORMAT),
+        "updated": now.strftime(DATE_FORMAT),
+        "messages": 0,
+    })
+    return conv_id
+
+
+def list_conversations(storage, limit=None):
+    """Return (conversation id, index entry) pairs, newest first"""
+    return storage.query(CONVERSATIONS_STORE, limit=limit, reverse=True)
+
+
+def message_count(storage, conv_id):
+    return storage.count(MESSAGES_STORE, conv_id + SEPARATOR, conv_id + RANGE_END)
+
+
+def append_message(storage, conv_id, role, content):
+    """Store a message at the end of a conversation and update its index entry; return its key"""
+    when = datetime.now()
+    now = when.strftime(DATE_FORMAT)
+    key = message_key(conv_id, when)
+    storage.put(MESSAGES_STORE, key, {"role": role, "content": content, "time": now})
+
+    entry = dict(storage.get(CONVERSATIONS_STORE, conv_id) or {"title": "New conversation"})
+    entry["messages"] = message_count(storage, conv_id)
+    entry["updated"] = now
+    entry.setdefault("created", now)
+    if role == "user" and entry["title"] == "New conversation":
+        entry["title"] = content if len(content) <= TITLE_LENGTH else content[:TITLE_LENGTH - 3] + "..."
+    storage.put(CONVERSATIONS_STORE, conv_id, entry)
+    return key
+
+
+def recent_messages(storage, conv_id, n):
+    """Return the last n messages of a conversation, oldest first, as plain dicts"""
+    rows = storage.query(
+        MESSAGES_STORE, start=conv_id + SEPARATOR, end=conv_id + RANGE_END, limit=n, reverse=True
+    )
+    return [{"role": message["role"], "content": message["content"]} for _, message in reversed(rows)]
+
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Data export
+
+Entries are read from storage a page at a time and written out as they are
+encoded, as NDJSON (one {"store", "key", "value"} object per line) or CSV
+(store, key and the value as JSON), optionally compressed with gzip or zstd
+(requires the zstandard package). Memory use depends on the page size, not
+on the length of the history.
+
+Exports can be limited to some stores and to a date range; journal and mood
+keys start with their date, so the range is a key range.
+
+    python export.py -o export.ndjson.gz [--user <id>] [--format csv]
+                     [--compression zstd] [--since 2024-01-01] [--until 2024-12-31]
+                     [--store mood_entries]
+"""
+
+import argparse
+import csv
+import datetime
+import io
+import json
+import sys
+import tempfile
+import zlib
+
+from storage import DEFAULT_USER, get_storage, json_default
+
+# Stores that can be exported
+EXPORT_STORES = ("journal_entries", "mood_entries")
+
+# Format -> (MIME type, file extension)
+FORMATS = {
+    "ndjson": ("application/x-ndjson", ".ndjson"),
+    "csv": ("text/csv", ".csv"),
+}
+
+# Compression -> (MIME type, file extension)
+COMPRESSIONS = {
+    "none": (None, ""),
+    "gzip": ("application/gzip", ".gz"),
+    "zstd": ("application/zstd", ".zst"),
+}
+
+CSV_FIELDS = ["store", "key", "value"]
+
+# Entries read from storage at once
+PAGE_SIZE = 1000
+
+# Encoded output is handed on in chunks of about this many characters
+CHUNK_SIZE = 256 * 1024
+
+# Exports smaller than this are built in memory, larger ones in a temporary file
+SPOOL_SIZE = 16 * 1024 * 1024
+
+GZIP_LEVEL = 6
+
+
+def available_compressions():
+    """Compressions usable here; zstd needs the zstandard package"""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return [name for name in COMPRESSIONS if name != "zstd"]
+    return list(COMPRESSIONS)
+
+
+def date_range(since=None, until=None):
+    """Key range (start, end) covering the days since..until, both included; either may be None"""
+    start = since.isoformat() if since else None
+    end = (until + datetime.timedelta(days=1)).isoformat() if until else None
+    return start, end
+
+
+def iter_entries(storage, stores=EXPORT_STORES, since=None, until=None, page_size=PAGE_SIZE):
+    """Yield (store, key, value) for the entries of stores in the date range, one page at a time"""
+    start, end = date_range(since, until)
+    for store in stores:
+        cursor = start
+        while True:
+            page = storage.query(store, cursor, end, limit=page_size)
+            for key, value in page:
+                yield store, key, value
+            if len(page) < page_size:
+                break
+            # The smallest key after the last one read
+            cursor = page[-1][0] + "\0"
+
+
+# One encoder for all values; json.dumps with options would build a new one per call
+_to_json = json.JSONEncoder(ensure_ascii=False, default=json_default).encode
+
+
+def _encode_ndjson(entries):
+    lines = []
+    size = 0
+    for store, key, value in entries:
+        line = _to_json({"store": store, "key": key, "value": value})
+        lines.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            lines.append("")
+            yield "\n".join(lines)
+            lines, size = [], 0
+    if lines:
+        lines.append("")
+        yield "\n".join(lines)
+
+
+def _encode_csv(entries):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_FIELDS)
+    for store, key, value in entries:
+        writer.writerow((store, key, _to_json(value)))
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+_ENCODERS = {"ndjson": _encode_ndjson, "csv": _encode_csv}
+
+
+def _compressor(compression):
+    """Return an object with compress(data) and flush(), or None for no compression"""
+    if compression == "none":
+        return None
+    if compression == "gzip":
+        # wbits 31 writes a gzip header and trailer
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(f"Unknown compression: {compression!r}")
+
+
+def iter_export(storage, stores=EXPORT_STORES, fmt="ndjson", compression="none", since=None, until=None):
+    """Yield the export as chunks of bytes"""
+    if fmt not in _ENCODERS:
+        raise ValueError(f"Unknown format: {fmt!r}")
+    compressor = _compressor(compression)
+    for text in _ENCODERS[fmt](iter_entries(storage, stores, since, until)):
+        data = text.encode("utf-8")
+        yield compressor.compress(data) if compressor else data
+    if compressor:
+        yield compressor.flush()
+
+
+def write_export(storage, out, **options):
+    """Write the export to a binary file object; return the number of bytes written"""
+    written = 0
+    for chunk in iter_export(storage, **options):
+        if chunk:
+            out.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def export_file(storage, **options):
+    """Return the export in a temporary file, rewound, that spills to disk when large"""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    write_export(storage, spool, **options)
+    spool.seek(0)
+    return spool
+
+
+def file_name(fmt="ndjson", compression="none", user_id=DEFAULT_USER):
+    return f"mental_health_data_{user_id}{FORMATS[fmt][1]}{COMPRESSIONS[compression][1]}"
+
+
+def mime_type(fmt="ndjson", compression="none"):
+    return COMPRESSIONS[compression][0] or FORMATS[fmt][0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export data of Mental Health Companion Bot")
+    parser.add_argument("-o", "--output", default="-", help="output file, - for stdout (default)")
+    parser.add_argument("--user", default=DEFAULT_USER, help="user id (default: %(default)s)")
+    parser.add_argument("--format", choices=list(FORMATS), default="ndjson")
+    parser.add_argument("--compression", choices=list(COMPRESSIONS), default="none")
+    parser.add_argument("--store", action="append", choices=EXPORT_STORES,
+                        help="store to export; repeat for several (default: all)")
+    parser.add_argument("--since", type=datetime.date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument("--until", type=datetime.date.fromisoformat, help="last day, YYYY-MM-DD")
+    args = parser.parse_args(argv)
+
+    options = dict(stores=args.store or EXPORT_STORES, fmt=args.format, compression=args.compression,
+                   since=args.since, until=args.until)
+    storage = get_storage(args.user)
+    if args.output == "-":
+        write_export(storage, sys.stdout.buffer, **options)
+    else:
+        with open(args.output, "wb") as f:
+            written = write_export(storage, f, **options)
+        print(f"Wrote {written} bytes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
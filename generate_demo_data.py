@@ -4,10 +4,10 @@ Demo data generator for Mental Health Companion Bot
 This script populates the application with sample data for testing
 """
 
-import json
 import datetime
 import random
-from textblob import TextBlob
+import sentiment
+from storage import get_storage
 
 def generate_journal_entries():
     """Generate sample journal entries for the past 14 days"""
@@ -109,10 +109,18 @@ def generate_mood_entries():
         ]
     }
     
+    # Weather of each day, stored with its mood entries
+    weather_conditions = ["Clear", "Clouds", "Rain", "Drizzle", "Mist"]
+    
     # Generate entries with some randomness in time
     for i in range(14, 0, -1):
         # Base date
         base_date = datetime.datetime.now() - datetime.timedelta(days=i)
+        day_weather = {
+            "temp": round(random.uniform(5, 25), 1),
+            "humidity": float(random.randint(40, 95)),
+            "condition": random.choice(weather_conditions)
+        }
         
         # Add 1-3 entries per day with random times
         entries_count = random.randint(1, 3)
@@ -131,16 +139,18 @@ def generate_mood_entries():
             detail = random.choice(mood_details[mood])
             notes = template.format(mood_desc=mood.lower(), detail=detail)
             
-            # Calculate sentiment score
-            analysis = TextBlob(notes)
-            sentiment_score = analysis.sentiment.polarity
-            
             mood_entries[date_key] = {
                 "mood": mood,
                 "notes": notes,
-                "sentiment_score": sentiment_score
+                "weather": day_weather
             }
     
+    # Score all notes in one batch; repeated notes are only scored once
+    entries = list(mood_entries.values())
+    scores = sentiment.score_batch([entry["notes"] for entry in entries])
+    for entry, sentiment_score in zip(entries, scores):
+        entry["sentiment_score"] = sentiment_score
+    
     return mood_entries
 
 def save_demo_data():
@@ -149,13 +159,10 @@ def save_demo_data():
     journal_entries = generate_journal_entries()
     mood_entries = generate_mood_entries()
     
-    # Save journal entries
-    with open("journal_entries.json", "w") as f:
-        json.dump(journal_entries, f, indent=2)
-    
-    # Save mood entries
-    with open("mood_entries.json", "w") as f:
-        json.dump(mood_entries, f, indent=2)
+    # Save through the storage layer so the files are replaced atomically
+    storage = get_storage()
+    storage.replace("journal_entries", journal_entries)
+    storage.replace("mood_entries", mood_entries)
     
     print("Demo data generated successfully!")
     print(f"Created {len(journal_entries)} journal entries")
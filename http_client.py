@@ -0,0 +1,47 @@
+"""
+Pooled HTTP sessions for the external APIs the app talks to
+
+Each API gets one requests session per process, so consecutive requests reuse
+connections, with a retry policy that backs off exponentially on connection
+errors and overloaded responses (429/5xx).
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+POOL_SIZE = 16
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def new_session(pool_size=POOL_SIZE, retries=MAX_RETRIES, retry_post=False):
+    """Return a requests session with a connection pool and retry policy"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None if retry_post else Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(name, **options):
+    """Return the process-wide session for an API, creating it on first use"""
+    with _sessions_lock:
+        if name not in _sessions:
+            _sessions[name] = new_session(**options)
+        return _sessions[name]
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Data import
+
+Reads the files written by export.py (NDJSON or CSV, plain, gzip or zstd
+compressed), the JSON file of the old Settings export, and mood CSVs from
+other apps (a date column, optionally a time column, a mood and a note, as
+exported by Daylio and similar apps).
+
+Rows are validated, deduplicated by their timestamp key and merged into
+storage in batches with put_many(), so the file is never held in memory as a
+whole (except the old JSON export, which is a single document). Entries that
+already exist are kept unless overwriting is asked for. Mood notes without a
+score and imported journal entries are scored for sentiment a batch at a time.
+
+    python importer.py export.ndjson.gz [--user <id>] [--overwrite]
+"""
+
+import argparse
+import csv
+import datetime
+import gzip
+import io
+import json
+import math
+import sys
+
+import sentiment
+from export import CSV_FIELDS, EXPORT_STORES
+from mood_data import MOOD_OPTIONS, MOOD_SCORES
+from storage import DEFAULT_USER, get_storage
+
+# Entries written to storage at once
+BATCH_SIZE = 1000
+
+# Error messages kept for the report
+MAX_ERRORS = 20
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Mood names used by other apps and older versions (lowercase) -> mood of this app
+MOOD_ALIASES = {
+    "very bad": "Very Bad", "awful": "Very Bad", "terrible": "Very Bad", "very sad": "Very Bad", "1": "Very Bad",
+    "bad": "Bad", "sad": "Bad", "low": "Bad", "2": "Bad",
+    "neutral": "Neutral", "meh": "Neutral", "ok": "Neutral", "okay": "Neutral", "3": "Neutral",
+    "good": "Good", "happy": "Good", "4": "Good",
+    "excellent": "Excellent", "rad": "Excellent", "great": "Excellent", "very happy": "Excellent",
+    "awesome": "Excellent", "5": "Excellent",
+}
+
+# Column names tried, in order, for mood CSVs of other apps
+DATE_COLUMNS = ("full_date", "date", "datetime", "timestamp", "day")
+TIME_COLUMNS = ("time",)
+MOOD_COLUMNS = ("mood", "feeling", "rating")
+NOTE_COLUMNS = ("note", "notes", "note_title", "comment", "comments")
+
+
+class ImportFileError(ValueError):
+    """The file could not be read at all; the message is safe to show"""
+
+
+class ImportReport:
+    """Counts of what happened to the rows of an import"""
+
+    def __init__(self):
+        self.imported = 0
+        self.existing = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors = []
+
+    def error(self, row, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"Row {row}: {message}")
+
+    def summary(self):
+        return (f"{self.imported} entries imported, {self.existing} already present, "
+                f"{self.duplicates} duplicates and {self.invalid} invalid rows skipped")
+
+
+# Reading files
+
+def open_text(file):
+    """Return a text stream over a binary file object, decompressing gzip or zstd"""
+    head = file.read(4)
+    file.seek(0)
+    if head.startswith(GZIP_MAGIC):
+        file = gzip.GzipFile(fileobj=file, mode="rb")
+    elif head == ZSTD_MAGIC:
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportFileError("This file is zstd compressed; install the zstandard package to import it.")
+        file = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(file))
+    return io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+
+def read_records(text):
+    """Yield (row number, store, key, value) from an export or a mood CSV"""
+    first = text.readline()
+    if first.lstrip().startswith("{"):
+        try:
+            record = json.loads(first)
+        except ValueError:
+            record = None
+        if isinstance(record, dict) and "store" in record:
+            yield from _read_ndjson(first, text)
+        else:
+            yield from _read_json(first + text.read())
+        return
+
+    header = next(csv.reader([first]), [])
+    fields = [name.strip().lower() for name in header]
+    rows = csv.reader(text)
+    if fields == CSV_FIELDS:
+        yield from _read_export_csv(rows)
+    else:
+        yield from _read_mood_csv(fields, rows)
+
+
+def _read_ndjson(first, lines):
+    yield _ndjson_record(1, first)
+    for number, line in enumerate(lines, 2):
+        if line.strip():
+            yield _ndjson_record(number, line)
+
+
+def _ndjson_record(number, line):
+    try:
+        record = json.loads(line)
+        return number, record["store"], record["key"], record["value"]
+    except (ValueError, KeyError, TypeError):
+        return number, None, None, "not an export record"
+
+
+def _read_json(document):
+    # The old Settings export: {"journal_entries": {...}, "mood_entries": {...}}
+    try:
+        data = json.loads(document)
+    except ValueError as error:
+        raise ImportFileError(f"This is not a valid export file: {error}")
+    if not isinstance(data, dict):
+        raise ImportFileError("This is not a valid export file.")
+    number = 0
+    for store, entries in data.items():
+        for key, value in (entries.items() if isinstance(entries, dict) else []):
+            number += 1
+            yield number, store, key, value
+
+
+def _read_export_csv(rows):
+    for number, row in enumerate(rows, 2):
+        if not row:
+            continue
+        try:
+            store, key, value = row
+            yield number, store, key, json.loads(value)
+        except ValueError:
+            yield number, None, None, "expected store, key and a JSON value"
+
+
+def _column(fields, names):
+    for name in names:
+        if name in fields:
+            return fields.index(name)
+    return None
+
+
+def _read_mood_csv(fields, rows):
+    date_column = _column(fields, DATE_COLUMNS)
+    mood_column = _column(fields, MOOD_COLUMNS)
+    if date_column is None or mood_column is None:
+        raise ImportFileError("Unrecognised file: expected an export, or a CSV with date and mood columns.")
+    time_column = _column(fields, TIME_COLUMNS)
+    note_column = _column(fields, NOTE_COLUMNS)
+
+    for number, row in enumerate(rows, 2):
+        if not row:
+            continue
+        try:
+            when = parse_datetime(row[date_column], row[time_column] if time_column is not None else "")
+            mood = row[mood_column].strip()
+        except (ValueError, IndexError):
+            yield number, None, None, "missing or unreadable date, time or mood"
+            continue
+        notes = row[note_column].strip() if note_column is not None and note_column < len(row) else ""
+        yield number, "mood_entries", when.strftime("%Y-%m-%d %H:%M"), {"mood": mood, "notes": notes}
+
+
+def parse_datetime(date, time=""):
+    """Parse an ISO date or date and time, with the time optionally in a separate column ("20:30", "8:30 pm")"""
+    when = datetime.datetime.fromisoformat(date.strip().replace("/", "-"))
+    time = time.strip().lower()
+    if time:
+        parsed = datetime.datetime.strptime(time, "%I:%M %p" if time.endswith(("am", "pm")) else "%H:%M")
+        when = when.replace(hour=parsed.hour, minute=parsed.minute)
+    return when
+
+
+# Validation
+
+def validate(store, key, value):
+    """Return the (key, entry) to store, or raise ValueError with the reason it is rejected
+
+    Keys are rewritten in their canonical zero-padded form, so they sort
+    chronologically and the same time is always the same key.
+    """
+    if store not in EXPORT_STORES:
+        raise ValueError(value if store is None else f"unknown store {store!r}")
+    if not isinstance(key, str):
+        raise ValueError("the key must be a date")
+
+    if store == "journal_entries":
+        key = _check_key(key, "%Y-%m-%d", "YYYY-MM-DD")
+        if not isinstance(value, str):
+            raise ValueError("a journal entry must be text")
+        return key, value
+
+    key = _check_key(key, "%Y-%m-%d %H:%M", "YYYY-MM-DD HH:MM")
+    mood = value.get("mood") if isinstance(value, dict) else None
+    mood = MOOD_ALIASES.get(str(mood).strip().lower(), mood)
+    if mood not in MOOD_OPTIONS:
+        raise ValueError(f"the mood must be one of {', '.join(MOOD_OPTIONS)}")
+    entry = {"mood": mood, "notes": str(value.get("notes") or "")}
+    if value.get("sentiment_score") is not None:
+        entry["sentiment_score"] = _check_score(value["sentiment_score"])
+    if value.get("weather"):
+        entry["weather"] = _check_weather(value["weather"])
+    return key, entry
+
+
+def _check_score(score):
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        score = math.nan
+    if not math.isfinite(score):
+        raise ValueError("the sentiment score must be a number")
+    return max(-1.0, min(1.0, score))
+
+
+def _check_weather(weather):
+    # The fields weather_mood.weather_fields() stores; the statistics need all three
+    try:
+        fields = {"temp": float(weather["temp"]), "humidity": float(weather["humidity"]),
+                  "condition": weather["condition"]}
+    except (KeyError, TypeError, ValueError):
+        fields = None
+    if (fields is None or not isinstance(fields["condition"], str)
+            or not all(math.isfinite(fields[name]) for name in ("temp", "humidity"))):
+        raise ValueError("the weather needs a numeric temp and humidity and a condition")
+    return fields
+
+
+def _check_key(key, key_format, shown):
+    # strptime also accepts unpadded fields ("2024-1-5 8:30"); return the padded key
+    try:
+        return datetime.datetime.strptime(key.strip(), key_format).strftime(key_format)
+    except ValueError:
+        raise ValueError(f"{key!r} is not in the form {shown}")
+
+
+# Merging
+
+def import_records(storage, records, overwrite=False, batch_size=BATCH_SIZE, workers=None):
+    """Validate, deduplicate and store (row, store, key, value) records; return an ImportReport"""
+    report = ImportReport()
+    seen = {store: set() for store in EXPORT_STORES}
+    batches = {store: [] for store in EXPORT_STORES}
+
+    for number, store, key, value in records:
+        try:
+            key, entry = validate(store, key, value)
+        except (ValueError, TypeError) as error:
+            report.error(number, str(error) or "invalid entry")
+            continue
+        if key in seen[store]:
+            report.duplicates += 1
+            continue
+        seen[store].add(key)
+        batches[store].append((key, entry))
+        if len(batches[store]) >= batch_size:
+            _write_batch(storage, store, batches[store], overwrite, report, workers)
+            batches[store] = []
+
+    for store, batch in batches.items():
+        _write_batch(storage, store, batch, overwrite, report, workers)
+    return report
+
+
+def _write_batch(storage, store, batch, overwrite, report, workers):
+    if not overwrite:
+        fresh = [(key, entry) for key, entry in batch if storage.get(store, key) is None]
+        report.existing += len(batch) - len(fresh)
+        batch = fresh
+    if not batch:
+        return
+
+    if store == "journal_entries":
+        scores = sentiment.score_batch([text for _, text in batch], workers)
+        storage.put_many("journal_entries", batch)
+        storage.put_many(sentiment.JOURNAL_SENTIMENT_STORE, [
+            (key, {"score": score, "hash": sentiment.text_hash(text)})
+            for (key, text), score in zip(batch, scores)
+        ])
+    else:
+        unscored = [entry for _, entry in batch if "sentiment_score" not in entry]
+        scores = sentiment.score_batch([entry["notes"] for entry in unscored], workers)
+        for entry, score in zip(unscored, scores):
+            entry["sentiment_score"] = score if entry["notes"].strip() else MOOD_SCORES[entry["mood"]]
+        storage.put_many("mood_entries", batch)
+    report.imported += len(batch)
+
+
+def import_file(storage, file, overwrite=False, workers=None):
+    """Import a binary file object (export, old JSON export or mood CSV); return an ImportReport"""
+    try:
+        text = open_text(file)
+        return import_records(storage, read_records(text), overwrite, workers=workers)
+    except (UnicodeDecodeError, OSError, EOFError, csv.Error) as error:
+        raise ImportFileError(f"Could not read the file: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import data into Mental Health Companion Bot")
+    parser.add_argument("file", help="export (NDJSON/CSV, optionally .gz/.zst), old JSON export or mood CSV")
+    parser.add_argument("--user", default=DEFAULT_USER, help="user id (default: %(default)s)")
+    parser.add_argument("--overwrite", action="store_true", help="replace entries that already exist")
+    parser.add_argument("--workers", type=int, help="sentiment scoring processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    with open(args.file, "rb") as f:
+        try:
+            report = import_file(get_storage(args.user), f, args.overwrite, args.workers)
+        except ImportFileError as error:
+            print(error, file=sys.stderr)
+            return 1
+    print(report.summary())
+    for message in report.errors:
+        print(f"  {message}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
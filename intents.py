@@ -0,0 +1,153 @@
+"""
+Canned intents and cached replies shared by Chat Support and the Voice Assistant
+
+Chat messages that consist of nothing but a greeting or the name of a feature
+("hello", "how are you", "breathing"...) are answered locally, and model
+replies to short messages that open a conversation are cached per user by
+their normalized text, so common messages are answered without a network
+round trip. Later messages are never answered from the cache: a reply to
+"yes" or "why" depends on what was said before. Hit rates are
+exposed through reply_stats() for tuning.
+
+Messages that mention self-harm or a crisis are never answered from the
+intents or the cache, and negated messages ("I'm not feeling happy") never
+match an intent.
+"""
+
+import re
+import threading
+
+from caching import LRUCache
+
+RESPONSES = {
+    "hello": "Hello! How are you feeling today?",
+    "how are you": "I'm here to help you. How are you doing?",
+    "feeling sad": "I'm sorry to hear that. Remember that it's okay to feel sad sometimes. Would you like to try a breathing exercise?",
+    "feeling happy": "That's wonderful to hear! It's great that you're having a good day.",
+    "breathing": "Would you like to start a guided breathing exercise?",
+    "journal": "Would you like to write in your journal today?",
+    "mood": "Would you like to record your mood today?",
+    "help": "I'm here to help with guided breathing, journaling, mood tracking, and more. What would you like assistance with?"
+}
+
+DEFAULT_RESPONSE = "I'm listening. How can I help you today?"
+
+CRISIS_RESPONSE = (
+    "It sounds like you are going through something really painful, and you don't have to face it alone. "
+    "If you are in danger or thinking about harming yourself, please call your local emergency number "
+    "or a crisis line (in the US, call or text 988), or reach out to someone you trust right now."
+)
+
+# Whole chat messages answered locally -> intent. Only greetings and feature
+# names: anything longer, or a bare "help", may carry more and goes to the model
+LOCAL_MESSAGES = {
+    "hello": "hello", "hello there": "hello", "hi": "hello", "hi there": "hello",
+    "hey": "hello", "hey there": "hello", "good morning": "hello",
+    "good afternoon": "hello", "good evening": "hello",
+    "how are you": "how are you", "how are you doing": "how are you", "how are you today": "how are you",
+    "breathing": "breathing", "breathing exercise": "breathing",
+    "journal": "journal", "mood": "mood",
+}
+
+# Words and phrases that make a message sensitive (matched as whole words)
+RISK_WORDS = {
+    "die", "dying", "dead", "death", "suicide", "suicidal", "kill", "killing", "hurt", "hurting",
+    "harm", "harming", "cut", "cutting", "overdose", "hopeless", "worthless", "abuse", "abused",
+    "unsafe", "crisis", "emergency",
+}
+RISK_PHRASES = ("end it", "end my life", "no reason to live", "better off without me", "give up on life")
+
+NEGATIONS = {"not", "no", "never", "nothing", "nobody", "hardly", "without", "cannot", "dont", "cant", "wont"}
+
+# Only replies to opening messages this short are cached; longer ones are rarely repeated word for word
+MAX_CACHED_WORDS = 12
+REPLY_TTL = 6 * 3600
+
+_NON_WORD = re.compile(r"[^a-z0-9']+")
+
+_replies = LRUCache(maxsize=1024, ttl=REPLY_TTL)  # (user id, normalized message) -> reply
+_intent_hits = 0
+_intent_misses = 0
+_stats_lock = threading.Lock()
+
+
+def normalize(text):
+    """Lowercase text and reduce it to single-spaced words"""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def is_sensitive(text):
+    """Whether text mentions self-harm or a crisis"""
+    prompt = normalize(text)
+    padded = f" {prompt} "
+    return bool(RISK_WORDS.intersection(prompt.split())) or any(f" {phrase} " in padded for phrase in RISK_PHRASES)
+
+
+def _negated(prompt):
+    return any(word in NEGATIONS or word.endswith("n't") for word in prompt.split())
+
+
+def match_intent(text):
+    """Return the first intent whose keywords appear as whole words in text, or None
+
+    Sensitive and negated messages match no intent.
+    """
+    prompt = normalize(text)
+    if is_sensitive(prompt) or _negated(prompt):
+        return None
+    padded = f" {prompt} "
+    for intent in RESPONSES:
+        if f" {intent} " in padded:
+            return intent
+    return None
+
+
+def intent_response(text):
+    """Canned reply for text, falling back to a generic prompt"""
+    if is_sensitive(text):
+        return CRISIS_RESPONSE
+    intent = match_intent(text)
+    return RESPONSES[intent] if intent else DEFAULT_RESPONSE
+
+
+def local_reply(text, user_id, context=()):
+    """Answer a user's chat message from the intents or their reply cache, or return None
+
+    context is the conversation before the message; the cache is only used
+    when there is none.
+    """
+    global _intent_hits, _intent_misses
+    prompt = normalize(text)
+    if is_sensitive(prompt):
+        return None
+
+    intent = LOCAL_MESSAGES.get(prompt)
+    with _stats_lock:
+        if intent:
+            _intent_hits += 1
+        else:
+            _intent_misses += 1
+    if intent:
+        return RESPONSES[intent]
+
+    if not context and len(prompt.split()) <= MAX_CACHED_WORDS:
+        return _replies.get((user_id, prompt))
+    return None
+
+
+def remember_reply(text, reply, user_id, context=()):
+    """Cache a model reply to a user's short message, if it opened the conversation"""
+    prompt = normalize(text)
+    if reply and not context and len(prompt.split()) <= MAX_CACHED_WORDS and not is_sensitive(prompt):
+        _replies.set((user_id, prompt), reply)
+
+
+def reply_stats():
+    with _stats_lock:
+        total = _intent_hits + _intent_misses
+        intents = {
+            "hits": _intent_hits,
+            "misses": _intent_misses,
+            "hit_rate": _intent_hits / total if total else 0.0,
+        }
+    return {"intents": intents, "cache": _replies.stats()}
@@ -0,0 +1,157 @@
+"""
+Trend analytics over a user's mood history
+
+Per-day score sums and counts plus the mood distribution are built once from
+the mood store and then kept up to date by a storage listener as entries are
+saved or deleted. Every statistic only looks at a fixed number of days, so the
+cost of showing it does not grow with the length of the history.
+"""
+
+import datetime
+import threading
+from collections import Counter
+
+from caching import EngineCache
+from mood_data import MOOD_OPTIONS
+from storage import subscribe
+
+
+class MoodAnalytics:
+    """Incrementally maintained aggregates of one user's mood entries"""
+
+    def __init__(self, version=None):
+        self.version = version
+        self.daily = {}
+        self.moods = Counter()
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_entries(cls, mood_history, version=None):
+        """Build the aggregates from (date key, entry) pairs in a single pass
+
+        Plain Python on purpose: the Dashboard uses these statistics and should
+        not have to import pandas.
+        """
+        engine = cls(version)
+        for key, entry in mood_history:
+            engine._add(key, entry, 1)
+        return engine
+
+    def apply(self, key, old, new):
+        """Replace the contribution of entry `key` (old value) with its new value"""
+        with self._lock:
+            if old is not None:
+                self._add(key, old, -1)
+            if new is not None:
+                self._add(key, new, 1)
+
+    def _add(self, key, entry, sign):
+        day = key[:10]
+        score = float(entry["sentiment_score"])
+        bucket = self.daily.setdefault(day, [0.0, 0])
+        bucket[0] += sign * score
+        bucket[1] += sign
+        if bucket[1] <= 0:
+            del self.daily[day]
+        self.moods[entry["mood"]] += sign
+        if self.moods[entry["mood"]] <= 0:
+            del self.moods[entry["mood"]]
+        self.count += sign
+        self.total += sign * score
+
+    # Statistics
+
+    def _window(self, days, today):
+        total, count = 0.0, 0
+        for offset in range(days):
+            bucket = self.daily.get((today - datetime.timedelta(days=offset)).isoformat())
+            if bucket:
+                total += bucket[0]
+                count += bucket[1]
+        return total, count
+
+    def rolling_mean(self, days, today=None):
+        """Mean score of all entries in the last `days` days, or None without entries"""
+        with self._lock:
+            total, count = self._window(days, today or datetime.date.today())
+        return total / count if count else None
+
+    def daily_series(self, days=90, today=None):
+        """Return (day, daily mean, rolling 7-day mean, rolling 30-day mean) for the last `days` days"""
+        today = today or datetime.date.today()
+        first = today - datetime.timedelta(days=days - 1)
+        with self._lock:
+            buckets = [
+                self.daily.get((first + datetime.timedelta(days=offset)).isoformat(), (0.0, 0))
+                for offset in range(-29, days)
+            ]
+
+        series = []
+        sums = [0.0, 0.0]
+        counts = [0, 0]
+        for index, (total, count) in enumerate(buckets):
+            # Sliding windows over the per-day buckets
+            for slot, width in enumerate((7, 30)):
+                sums[slot] += total
+                counts[slot] += count
+                if index >= width:
+                    sums[slot] -= buckets[index - width][0]
+                    counts[slot] -= buckets[index - width][1]
+            if index >= 29:
+                day = first + datetime.timedelta(days=index - 29)
+                series.append((
+                    day,
+                    total / count if count else None,
+                    sums[0] / counts[0] if counts[0] else None,
+                    sums[1] / counts[1] if counts[1] else None,
+                ))
+        return series
+
+    def weekly_means(self, weeks=8, today=None):
+        """Return (week start, mean score) for the last `weeks` weeks, oldest first"""
+        today = today or datetime.date.today()
+        monday = today - datetime.timedelta(days=today.weekday())
+        result = []
+        with self._lock:
+            for week in range(weeks - 1, -1, -1):
+                start = monday - datetime.timedelta(weeks=week)
+                total, count = self._window(7, start + datetime.timedelta(days=6))
+                result.append((start, total / count if count else None))
+        return result
+
+    def streak(self, today=None):
+        """Number of consecutive days with at least one entry, ending today or yesterday"""
+        day = today or datetime.date.today()
+        with self._lock:
+            if day.isoformat() not in self.daily:
+                day -= datetime.timedelta(days=1)
+            streak = 0
+            while day.isoformat() in self.daily:
+                streak += 1
+                day -= datetime.timedelta(days=1)
+        return streak
+
+    def distribution(self):
+        """Number of entries per mood category, in mood order"""
+        with self._lock:
+            return {mood: self.moods.get(mood, 0) for mood in MOOD_OPTIONS}
+
+    def summary(self, today=None):
+        return {
+            "entries": self.count,
+            "average": self.total / self.count if self.count else None,
+            "avg_7d": self.rolling_mean(7, today),
+            "avg_30d": self.rolling_mean(30, today),
+            "streak": self.streak(today),
+        }
+
+
+_engines = EngineCache("mood_entries", MoodAnalytics.from_entries)
+subscribe(_engines.on_change)
+
+
+def get_analytics(storage):
+    """Return the analytics engine of the storage's user, rebuilding it only if out of date"""
+    return _engines.get(storage)
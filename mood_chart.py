@@ -0,0 +1,87 @@
+"""
+Mood history chart for the Mood Tracker page
+
+The rendered chart is cached per user, date range and data version, so reruns
+that don't add or delete an entry reuse the previous PNG instead of rebuilding
+the matplotlib figure. The data comes from the shared mood frame in mood_data.
+"""
+
+import io
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+from caching import LRUCache
+from mood_data import mood_frame_since
+
+# Above this many points the chart shows time-bucketed averages instead
+MAX_CHART_POINTS = 3000
+
+# Horizontal guides and labels for the mood zones
+MOOD_ZONES = [
+    (0.75, 0.9, "Excellent", "darkgreen"),
+    (0.25, 0.5, "Good", "green"),
+    (0, 0, "Neutral", "gray"),
+    (-0.25, -0.5, "Bad", "orange"),
+    (-0.75, -0.9, "Very Bad", "red"),
+]
+
+_charts = LRUCache(maxsize=64)
+
+
+def mood_chart_png(storage, user_id, start=None):
+    """Return the mood history chart as PNG bytes"""
+    key = (user_id, start, storage.version("mood_entries"))
+    return _charts.get_or_compute(key, lambda: render_mood_chart(mood_frame_since(storage, user_id, start)))
+
+
+def downsample(mood_df, max_points=MAX_CHART_POINTS):
+    """Average scores into equal time buckets so at most max_points remain"""
+    scores = mood_df["sentiment_score"]
+    if len(scores) <= max_points:
+        return scores
+    span = scores.index[-1] - scores.index[0]
+    bucket = max(span / max_points, pd.Timedelta(minutes=1)).ceil("min")
+    return scores.resample(bucket).mean().dropna()
+
+
+def render_mood_chart(mood_df):
+    """Render the mood history chart to PNG bytes"""
+    scores = downsample(mood_df)
+    downsampled = len(scores) < len(mood_df)
+
+    # A bare Figure is not registered with pyplot, so it is freed as soon as
+    # it goes out of scope instead of accumulating across reruns
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+
+    # Plot sentiment scores
+    if downsampled:
+        ax.plot(scores.index, scores.values, linestyle='-', color='blue')
+    else:
+        ax.plot(scores.index, scores.values, marker='o', linestyle='-', color='blue')
+
+    # Customize the plot
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Mood Score")
+    title = "Mood History Over Time"
+    if downsampled:
+        title += " (averaged)"
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+
+    # Improve x-axis date formatting
+    ax.tick_params(axis="x", labelrotation=45)
+
+    # Set y-axis limits
+    ax.set_ylim(-1.1, 1.1)
+
+    # Add horizontal lines and text labels for mood categories
+    first_date = scores.index[0]
+    for line_y, label_y, label, color in MOOD_ZONES:
+        ax.axhline(y=line_y, color=color, alpha=0.3, linestyle='--')
+        ax.text(first_date, label_y, label, color=color)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    return buffer.getvalue()
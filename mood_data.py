@@ -0,0 +1,60 @@
+"""
+Typed, columnar view of a user's mood history
+
+The mood store is turned into a single DataFrame with a datetime64 index, an
+ordered categorical `mood` column and a float32 `sentiment_score` column. It is
+built with vectorized parsing from the requested date range only, cached per
+range and data version and shared by the mood chart and the mood log, so
+none of them re-derive it.
+
+pandas and numpy are imported on first use, so importing this module for its
+constants stays cheap.
+"""
+
+from caching import LRUCache
+
+MOOD_OPTIONS = ["Very Bad", "Bad", "Neutral", "Good", "Excellent"]
+
+# Sentiment score used when a mood is saved without notes
+MOOD_SCORES = {"Very Bad": -1.0, "Bad": -0.5, "Neutral": 0.0, "Good": 0.5, "Excellent": 1.0}
+
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+_frames = LRUCache(maxsize=64)
+
+
+def mood_frame(storage, user_id):
+    """Return the user's whole mood history, cached until an entry is added or deleted"""
+    key = (user_id, storage.version("mood_entries"))
+    return _frames.get_or_compute(key, lambda: build_mood_frame(storage.query("mood_entries")))
+
+
+def mood_frame_since(storage, user_id, start=None):
+    """Return the mood history from start (a "%Y-%m-%d" date) onwards
+
+    Only the entries from start are queried from storage; the frame is cached
+    per start day and data version.
+    """
+    if start is None:
+        return mood_frame(storage, user_id)
+    key = (user_id, start, storage.version("mood_entries"))
+    return _frames.get_or_compute(key, lambda: build_mood_frame(storage.query("mood_entries", start=start)))
+
+
+def build_mood_frame(mood_history):
+    """Convert (date key, entry) pairs into the typed mood frame"""
+    import numpy as np
+    import pandas as pd
+
+    count = len(mood_history)
+    keys = [key for key, _ in mood_history]
+    entries = [entry for _, entry in mood_history]
+
+    index = pd.DatetimeIndex(pd.to_datetime(keys, format=DATE_FORMAT), name="date")
+    moods = pd.Categorical([entry["mood"] for entry in entries], categories=MOOD_OPTIONS, ordered=True)
+    scores = np.fromiter((entry["sentiment_score"] for entry in entries), dtype=np.float32, count=count)
+
+    mood_df = pd.DataFrame({"mood": moods, "sentiment_score": scores}, index=index)
+    if not mood_df.index.is_monotonic_increasing:
+        mood_df = mood_df.sort_index()
+    return mood_df
@@ -0,0 +1,274 @@
+"""
+Notification delivery
+
+notify() only queues a notification and returns; a background worker takes
+them off a bounded queue in batches and hands each batch to every sink:
+
+- InboxSink saves them to the user's "notifications" store, which the app
+  shows as toasts on the user's next rerun (this works from a sidecar too)
+- FileSink appends them to a JSON lines log, standing in for a push service
+- WebhookSink posts them as JSON to MHC_NOTIFY_WEBHOOK, if it is set
+
+A notification that is still waiting in the queue absorbs later ones with the
+same user and key (counting them), so a burst of identical reminders goes out
+once. When the queue is full, producers wait up to ENQUEUE_TIMEOUT seconds
+and are then turned away, so a flood slows down its senders instead of
+stalling the app or growing without bound.
+
+Users choose the categories they get on the Settings page; preferences are
+checked by the worker, just before delivery.
+"""
+
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+
+import reminders
+from storage import DATA_DIR, get_storage
+
+INBOX_STORE = "notifications"
+PREFERENCES_STORE = "preferences"
+
+# Category -> Settings label
+CATEGORIES = {
+    "breathing": "Breathing reminders",
+    "journal": "Journal reminders",
+    "mood": "Mood check-in reminders",
+    "affirmation": "Positive affirmations",
+    "weather": "Weather updates",
+    "inactivity": "Inactivity alerts",
+}
+
+DEFAULT_PREFERENCES = {
+    "enabled": True,
+    "breathing": True,
+    "journal": True,
+    "mood": True,
+    "affirmation": True,
+    "weather": False,
+    "inactivity": True,
+}
+
+# Reminder type -> category; other reminders only follow the main switch
+REMINDER_CATEGORIES = {"breathing": "breathing", "journal": "journal", "mood": "mood"}
+
+NOTIFY_LOG = os.environ.get("MHC_NOTIFY_LOG", os.path.join(DATA_DIR, "logs", "notifications.jsonl"))
+NOTIFY_WEBHOOK = os.environ.get("MHC_NOTIFY_WEBHOOK")
+
+# Notifications allowed to wait for delivery
+MAX_QUEUED = 10000
+
+# Seconds a producer waits for room in a full queue before its notification is dropped
+ENQUEUE_TIMEOUT = 1.0
+
+# Largest batch handed to the sinks, and how long to wait for a batch to fill
+BATCH_SIZE = 200
+BATCH_WINDOW = 0.25
+
+WEBHOOK_TIMEOUT = (3, 10)
+
+
+# Preferences
+
+def get_preferences(storage):
+    """Return the user's notification preferences"""
+    return dict(DEFAULT_PREFERENCES, **(storage.get(PREFERENCES_STORE, "notifications") or {}))
+
+
+def save_preferences(storage, preferences):
+    storage.put(PREFERENCES_STORE, "notifications", dict(preferences))
+
+
+def wanted(preferences, category):
+    """Whether a user with these preferences gets notifications of a category"""
+    return preferences["enabled"] and (category is None or preferences.get(category, False))
+
+
+# Sinks
+
+class Sink:
+    """Destination of delivered notifications"""
+
+    def send(self, notifications):
+        """Deliver a batch of notifications (dicts, see Dispatcher.notify)"""
+        raise NotImplementedError
+
+
+class InboxSink(Sink):
+    """Keeps notifications in the user's storage until the app shows them"""
+
+    def send(self, notifications):
+        for notification in notifications:
+            storage = get_storage(notification["user"])
+            # Unread notifications with the same key are merged too
+            unread = storage.get(INBOX_STORE, notification["key"])
+            count = notification["count"] + (unread["count"] if unread else 0)
+            storage.put(INBOX_STORE, notification["key"], dict(notification, count=count))
+
+
+class FileSink(Sink):
+    """Appends notifications to a JSON lines file"""
+
+    def __init__(self, path=NOTIFY_LOG):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, notifications):
+        lines = "".join(json.dumps(notification, ensure_ascii=False) + "\n" for notification in notifications)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+class WebhookSink(Sink):
+    """Posts each batch as {"notifications": [...]} to a URL"""
+
+    def __init__(self, url=NOTIFY_WEBHOOK):
+        self.url = url
+
+    def send(self, notifications):
+        # requests is only imported when a webhook is configured, not on every page load
+        from http_client import get_session
+        response = get_session("notifications", retry_post=True).post(
+            self.url, json={"notifications": notifications}, timeout=WEBHOOK_TIMEOUT)
+        response.raise_for_status()
+
+
+def default_sinks():
+    sinks = [InboxSink(), FileSink()]
+    if NOTIFY_WEBHOOK:
+        sinks.append(WebhookSink())
+    return sinks
+
+
+# Dispatcher
+
+class Dispatcher:
+    """Bounded queue of notifications, delivered in batches by a background thread"""
+
+    def __init__(self, sinks=None, maxsize=MAX_QUEUED, batch_size=BATCH_SIZE, batch_window=BATCH_WINDOW):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._pending = {}  # (user, key) -> notification waiting in the queue
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = dict.fromkeys(["sent", "coalesced", "dropped", "filtered", "failed", "batches"], 0)
+
+    def notify(self, user_id, category, title, body="", key=None):
+        """Queue a notification; returns False if it was dropped because the queue stayed full"""
+        key = key or f"{category}:{title}"
+        created = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            waiting = self._pending.get((user_id, key))
+            if waiting is not None:
+                waiting.update(body=body, created=created, count=waiting["count"] + 1)
+                self._stats["coalesced"] += 1
+                return True
+            notification = {
+                "user": user_id, "category": category, "title": title, "body": body,
+                "key": key, "count": 1, "created": created,
+            }
+            self._pending[(user_id, key)] = notification
+            if self._thread is None:
+                if self.sinks is None:
+                    self.sinks = default_sinks()
+                self._thread = threading.Thread(target=self._run, name="notifications", daemon=True)
+                self._thread.start()
+
+        try:
+            self._queue.put((user_id, key), timeout=ENQUEUE_TIMEOUT)
+        except queue.Full:
+            with self._lock:
+                if self._pending.get((user_id, key)) is notification:
+                    del self._pending[(user_id, key)]
+                self._stats["dropped"] += notification["count"]
+            return False
+        return True
+
+    def flush(self):
+        """Wait until every queued notification has been delivered"""
+        self._queue.join()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, queued=self._queue.qsize())
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        with self._lock:
+            return len(batch), [self._pending.pop(ident) for ident in batch if ident in self._pending]
+
+    def _run(self):
+        while True:
+            taken, batch = self._next_batch()
+            self._deliver(self._wanted(batch))
+            for _ in range(taken):
+                self._queue.task_done()
+
+    def _deliver(self, batch):
+        if not batch:
+            return
+        failed = 0
+        for sink in self.sinks:
+            try:
+                sink.send(batch)
+            except Exception:  # A failing sink must not keep the others from delivering
+                failed += 1
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["sent"] += len(batch)
+            self._stats["failed"] += failed * len(batch)
+
+    def _wanted(self, batch):
+        preferences = {}
+        wanted_batch = []
+        for notification in batch:
+            user_id = notification["user"]
+            if user_id not in preferences:
+                preferences[user_id] = get_preferences(get_storage(user_id))
+            if wanted(preferences[user_id], notification["category"]):
+                wanted_batch.append(notification)
+        with self._lock:
+            self._stats["filtered"] += len(batch) - len(wanted_batch)
+        return wanted_batch
+
+
+dispatcher = Dispatcher()
+
+
+def notify(user_id, category, title, body="", key=None):
+    """Queue a notification for a user, see Dispatcher.notify"""
+    return dispatcher.notify(user_id, category, title, body, key)
+
+
+def take_inbox(storage):
+    """Remove and return the user's undelivered notifications, oldest first"""
+    if not storage.count(INBOX_STORE):
+        return []
+    unread = sorted((dict(notification) for _, notification in storage.query(INBOX_STORE)),
+                    key=lambda notification: notification["created"])
+    for notification in unread:
+        storage.delete(INBOX_STORE, notification["key"])
+    return unread
+
+
+@reminders.on_reminder
+def _on_reminder(user_id, reminder, fired_at):
+    title = reminders.REMINDER_TYPES[reminder["type"]]
+    notify(user_id, REMINDER_CATEGORIES.get(reminder["type"]), title,
+           reminder["note"] or "It's time.", key=f"reminder:{reminder['type']}")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Reminders
+
+Reminders of every user are kept in the system namespace (see SYSTEM_USER),
+in the "reminders" store keyed "<user>:<id>", so that one scheduler can load
+them all with a single query. Each one gives a time of day ("HH:MM") and the
+weekdays it repeats on (0 is Monday). When it fires, the time is recorded in
+"reminder_state" and the functions registered with on_reminder() are called.
+
+The scheduler runs inside the app process by default, along with the
+inactivity checks of activity.py. To run them as a sidecar instead, start
+the app with MHC_SCHEDULER=off and run:
+
+    python reminders.py run
+
+Times are the server's local time.
+"""
+
+import argparse
+import datetime
+import functools
+import os
+import sys
+import threading
+import time
+import uuid
+
+from scheduler import scheduler
+from storage import SYSTEM_USER, get_storage, subscribe
+
+REMINDERS_STORE = "reminders"
+STATE_STORE = "reminder_state"
+
+REMINDER_TYPES = {
+    "breathing": "Breathing Exercise",
+    "journal": "Journal Entry",
+    "mood": "Mood Check-in",
+    "medication": "Medication",
+    "water": "Drink Water",
+    "walk": "Take a Walk",
+    "stretch": "Stretch Break",
+}
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# "app" runs the scheduler in the Streamlit process, "off" leaves it to a sidecar
+SCHEDULER_MODE = os.environ.get("MHC_SCHEDULER", "app")
+
+# Seconds between checks for reminders changed by other processes
+SYNC_INTERVAL = 30
+
+# Callbacks notified when a reminder fires, see on_reminder()
+_handlers = []
+
+_started = threading.Event()
+_sync_lock = threading.Lock()
+_scheduled = set()  # keys of the reminders with a scheduler job
+_synced_version = None
+_changes = 0  # writes applied by _on_change, so sync() can tell its read is outdated
+
+
+def system_storage():
+    return get_storage(SYSTEM_USER)
+
+
+def on_reminder(callback):
+    """Call callback(user_id, reminder, fired_at) whenever a reminder fires"""
+    _handlers.append(callback)
+    return callback
+
+
+def next_fire(reminder, after):
+    """Return the first datetime after `after` the reminder is due, or None if it has no days"""
+    hour, minute = map(int, reminder["time"].split(":"))
+    for offset in range(8):
+        day = after.date() + datetime.timedelta(days=offset)
+        if day.weekday() in reminder["days"]:
+            due = datetime.datetime.combine(day, datetime.time(hour, minute))
+            if due > after:
+                return due
+    return None
+
+
+# Reminders of one user
+
+def add_reminder(user_id, kind, at, days, note=""):
+    """Save a reminder; `at` is a datetime.time and days are weekday numbers. Returns its key"""
+    if kind not in REMINDER_TYPES:
+        raise ValueError(f"Unknown reminder type: {kind!r}")
+    if not days:
+        raise ValueError("Pick at least one day")
+    key = f"{user_id}:{uuid.uuid4().hex[:12]}"
+    system_storage().put(REMINDERS_STORE, key, {
+        "user": user_id,
+        "type": kind,
+        "time": at.strftime("%H:%M"),
+        "days": sorted(set(days)),
+        "note": note,
+        "created": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+    })
+    return key
+
+
+def delete_reminder(key):
+    storage = system_storage()
+    storage.delete(REMINDERS_STORE, key)
+    storage.delete(STATE_STORE, key)
+
+
+def user_reminders(user_id):
+    """Return (key, reminder) pairs of one user; their keys share the "<user>:" prefix"""
+    return system_storage().query(REMINDERS_STORE, f"{user_id}:", f"{user_id};")
+
+
+def last_fired(key):
+    """Return when a reminder last fired ("%Y-%m-%d %H:%M"), or None"""
+    state = system_storage().get(STATE_STORE, key)
+    return state["fired"] if state else None
+
+
+def todays_reminders(user_id, now=None):
+    """Return (key, reminder, fired today) for the user's reminders due today, by time"""
+    now = now or datetime.datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    due = []
+    for key, reminder in user_reminders(user_id):
+        if now.weekday() in reminder["days"]:
+            fired = last_fired(key)
+            due.append((key, reminder, bool(fired and fired.startswith(today))))
+    return sorted(due, key=lambda item: item[1]["time"])
+
+
+# Scheduling
+
+def _fire(key):
+    storage = system_storage()
+    reminder = storage.get(REMINDERS_STORE, key)
+    if reminder is None:
+        return None
+    now = datetime.datetime.now()
+    storage.put(STATE_STORE, key, {"fired": now.strftime("%Y-%m-%d %H:%M")})
+    for callback in _handlers:
+        try:
+            callback(reminder["user"], reminder, now)
+        except Exception:  # One failing handler must not keep the others from running
+            pass
+    return _timestamp(next_fire(reminder, now))
+
+
+def _timestamp(due):
+    return due.timestamp() if due else None
+
+
+def _schedule(key, reminder, now):
+    due = next_fire(reminder, now)
+    if due is None:
+        scheduler.cancel(key)
+        _scheduled.discard(key)
+    else:
+        scheduler.schedule(key, due.timestamp(), functools.partial(_fire, key))
+        _scheduled.add(key)
+
+
+def sync():
+    """(Re)load every reminder into the scheduler if the store changed since the last sync"""
+    global _synced_version
+    storage = system_storage()
+    while True:
+        # Storage is read before taking _sync_lock: listeners run with the
+        # storage locks held and take _sync_lock, so the reverse order would deadlock
+        changes = _changes
+        version = storage.version(REMINDERS_STORE)
+        if version == _synced_version:
+            return
+        now = datetime.datetime.now()
+        jobs = []
+        for key, reminder in storage.query(REMINDERS_STORE):
+            due = next_fire(reminder, now)
+            if due is not None:
+                jobs.append((key, due.timestamp(), functools.partial(_fire, key)))
+        with _sync_lock:
+            if changes != _changes:
+                continue  # A listener applied a newer write meanwhile; read again
+            keys = {key for key, _, _ in jobs}
+            for key in _scheduled - keys:
+                scheduler.cancel(key)
+            scheduler.schedule_many(jobs)
+            _scheduled.clear()
+            _scheduled.update(keys)
+            _synced_version = version
+            return
+
+
+@subscribe
+def _on_change(storage, store, key, old, new, before, after):
+    global _changes, _synced_version
+    if storage.user_id != SYSTEM_USER or store != REMINDERS_STORE or not _started.is_set():
+        return
+    if key is None:
+        # The whole store was replaced
+        threading.Thread(target=sync, daemon=True).start()
+        return
+    # Only the scheduler's lock is taken under _sync_lock, never the storage's
+    with _sync_lock:
+        if new is None:
+            scheduler.cancel(key)
+            _scheduled.discard(key)
+        else:
+            _schedule(key, new, datetime.datetime.now())
+        _synced_version = after
+        _changes += 1
+
+
+def start():
+    """Load the reminders into the scheduler and keep it in sync; safe to call repeatedly"""
+    if _started.is_set():
+        return
+    _started.set()
+    scheduler.start()
+    sync()
+    scheduler.every("reminders:sync", SYNC_INTERVAL, sync)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reminder scheduler for Mental Health Companion Bot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("run", help="run the scheduler until interrupted")
+    list_parser = commands.add_parser("list", help="list reminders and when they fire next")
+    list_parser.add_argument("--user", help="only this user's reminders")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        now = datetime.datetime.now()
+        reminders = user_reminders(args.user) if args.user else system_storage().query(REMINDERS_STORE)
+        for key, reminder in reminders:
+            due = next_fire(reminder, now)
+            days = ", ".join(WEEKDAYS[day][:3] for day in reminder["days"])
+            upcoming = f"{due:%Y-%m-%d %H:%M}" if due else "never"
+            print(f"{key}  {REMINDER_TYPES[reminder['type']]} at {reminder['time']} on {days}  next: {upcoming}")
+        return
+
+    import activity
+    import notifications  # noqa: F401  (delivers the reminders that fire)
+    start()
+    activity.start()
+    print(f"Scheduling {len(_scheduled)} reminders and inactivity checks (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    # Run the importable module, which notification handlers register with
+    import reminders
+    sys.exit(reminders.main())
@@ -0,0 +1,182 @@
+"""
+Background job scheduler
+
+Jobs are kept in a heap ordered by their next run time and executed by an
+asyncio loop on a daemon thread, outside the Streamlit script. Looking up the
+next due job is O(1) and adding, replacing or cancelling one is O(log n), so
+tens of thousands of jobs are cheap to keep. Replaced and cancelled jobs are
+left in the heap and skipped when they surface; once they make up most of it,
+the heap is rebuilt from the live jobs. Rescheduling a job for the time it is
+already due at only swaps its callback, so repeated syncs add nothing.
+
+Job callbacks are plain functions run on the loop's thread pool, so a slow
+job does not hold up the others. A callback returns the time of its next run
+(a Unix timestamp), or None when it is done.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+# The heap is rebuilt when it holds more than twice as many entries as there
+# are jobs, plus this many
+COMPACT_SLACK = 64
+
+
+class Scheduler:
+    """Heap of timed jobs run by an asyncio loop on a background thread"""
+
+    def __init__(self, name="scheduler"):
+        self.name = name
+        self._heap = []  # (run at, sequence, job id)
+        self._jobs = {}  # job id -> (run at, sequence, callback)
+        self._running = set()  # (job id, sequence) taken off the heap and running
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wake = None
+        self._thread = None
+        self._started = threading.Event()
+
+    def start(self):
+        """Start the loop thread unless it is running already"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._thread_main, name=self.name, daemon=True)
+            self._thread.start()
+        self._started.wait()
+
+    def schedule(self, job_id, run_at, callback):
+        """Run callback() at run_at, replacing any job with the same id"""
+        with self._lock:
+            if self._update(job_id, run_at, callback):
+                return
+            self._push(job_id, run_at, callback)
+            self._compact()
+            first = self._heap[0][2] == job_id
+        if first:
+            self._notify()
+
+    def schedule_many(self, jobs):
+        """Add (job id, run at, callback) triples at once, heapifying instead of pushing each"""
+        with self._lock:
+            for job_id, run_at, callback in jobs:
+                if self._update(job_id, run_at, callback):
+                    continue
+                sequence = next(self._sequence)
+                self._jobs[job_id] = (run_at, sequence, callback)
+                self._heap.append((run_at, sequence, job_id))
+            if not self._compact():
+                heapq.heapify(self._heap)
+        self._notify()
+
+    def every(self, job_id, interval, callback, first_run=None):
+        """Run callback() every interval seconds"""
+        def run():
+            callback()
+            return time.time() + interval
+        self.schedule(job_id, time.time() + interval if first_run is None else first_run, run)
+
+    def cancel(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._compact()
+
+    def next_run(self):
+        """Return (run at, job id) of the next due job, or None"""
+        with self._lock:
+            self._drop_stale()
+            return (self._heap[0][0], self._heap[0][2]) if self._heap else None
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def _update(self, job_id, run_at, callback):
+        # Called with self._lock held; swaps the callback of a job already due at run_at
+        job = self._jobs.get(job_id)
+        if job is None or job[0] != run_at:
+            return False
+        self._jobs[job_id] = (run_at, job[1], callback)
+        return True
+
+    def _compact(self):
+        # Called with self._lock held; rebuilds the heap from the live jobs once
+        # stale entries dominate it. Returns whether it did
+        if len(self._heap) <= 2 * len(self._jobs) + COMPACT_SLACK:
+            return False
+        self._heap = [(run_at, sequence, job_id) for job_id, (run_at, sequence, _) in self._jobs.items()
+                      if (job_id, sequence) not in self._running]
+        heapq.heapify(self._heap)
+        return True
+
+    def _push(self, job_id, run_at, callback):
+        # Called with self._lock held
+        sequence = next(self._sequence)
+        self._jobs[job_id] = (run_at, sequence, callback)
+        heapq.heappush(self._heap, (run_at, sequence, job_id))
+
+    def _drop_stale(self):
+        # Called with self._lock held; pops entries of replaced or cancelled jobs
+        while self._heap:
+            run_at, sequence, job_id = self._heap[0]
+            job = self._jobs.get(job_id)
+            if job is not None and job[1] == sequence:
+                return
+            heapq.heappop(self._heap)
+
+    def _notify(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._wake = asyncio.Event()
+        self._started.set()
+        self._loop.run_until_complete(self._run())
+
+    async def _run(self):
+        while True:
+            due = []
+            with self._lock:
+                now = time.time()
+                self._drop_stale()
+                while self._heap and self._heap[0][0] <= now:
+                    _, sequence, job_id = heapq.heappop(self._heap)
+                    due.append((job_id, sequence, self._jobs[job_id][2]))
+                    self._running.add((job_id, sequence))
+                    self._drop_stale()
+                delay = self._heap[0][0] - now if self._heap else None
+
+            for job_id, sequence, callback in due:
+                self._loop.create_task(self._execute(job_id, sequence, callback))
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, job_id, sequence, callback):
+        try:
+            run_at = await self._loop.run_in_executor(None, callback)
+        except Exception:  # A failing job must not stop the scheduler
+            run_at = None
+        with self._lock:
+            self._running.discard((job_id, sequence))
+            job = self._jobs.get(job_id)
+            if job is None or job[1] != sequence:
+                return  # Replaced or cancelled while it ran
+            if run_at is None:
+                del self._jobs[job_id]
+                return
+            self._push(job_id, run_at, callback)
+            first = self._heap[0][2] == job_id
+        if first:
+            self._notify()
+
+
+scheduler = Scheduler()
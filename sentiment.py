@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Sentiment scoring for mood notes and journal entries
+
+Scores are memoized by a hash of the text in a process-wide LRU cache, and
+journal scores are stored next to the entries together with that hash, so
+unchanged text is never scored twice. score_batch() deduplicates its input
+and can spread large batches over a process pool.
+
+Run `python sentiment.py backfill` to score the existing history of one or
+all users.
+"""
+
+import argparse
+import hashlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from caching import LRUCache
+from storage import DEFAULT_USER, get_storage, list_users
+
+# Store holding journal scores, keyed like journal_entries
+JOURNAL_SENTIMENT_STORE = "journal_sentiment"
+
+# Batches with fewer uncached texts than this are scored in-process
+MIN_POOL_BATCH = 64
+
+_scores = LRUCache(maxsize=8192)
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _polarity(text):
+    # Imported lazily so pool workers and pages without scoring skip TextBlob
+    from textblob import TextBlob
+    return TextBlob(text).sentiment.polarity
+
+
+def score(text):
+    """Return the polarity of text between -1.0 and 1.0"""
+    if not text or not text.strip():
+        return 0.0
+    return _scores.get_or_compute(text_hash(text), lambda: _polarity(text))
+
+
+def score_batch(texts, workers=None):
+    """Score many texts at once, computing each distinct uncached text only once"""
+    hashes = [text_hash(text) if text and text.strip() else None for text in texts]
+
+    pending = {}
+    for digest, text in zip(hashes, texts):
+        if digest is not None and digest not in pending and _scores.get(digest) is None:
+            pending[digest] = text
+
+    if pending:
+        missing = list(pending.values())
+        if workers != 1 and len(missing) >= MIN_POOL_BATCH:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_polarity, missing, chunksize=32))
+        else:
+            results = [_polarity(text) for text in missing]
+        for digest, result in zip(pending, results):
+            _scores.set(digest, result)
+
+    results = []
+    for digest, text in zip(hashes, texts):
+        if digest is None:
+            results.append(0.0)
+            continue
+        result = _scores.get(digest)
+        if result is None:
+            # Evicted by the batch itself; score again rather than fail
+            result = _polarity(text)
+        results.append(result)
+    return results
+
+
+def score_journal_entry(storage, date, text):
+    """Score a journal entry and store the result, unless the text is unchanged"""
+    digest = text_hash(text)
+    stored = storage.get(JOURNAL_SENTIMENT_STORE, date)
+    if stored is not None and stored["hash"] == digest:
+        return stored["score"]
+    result = score(text)
+    storage.put(JOURNAL_SENTIMENT_STORE, date, {"score": result, "hash": digest})
+    return result
+
+
+def cache_stats():
+    return _scores.stats()
+
+
+# Backfill
+
+def backfill(storage, workers=None):
+    """Score every journal entry and mood note of a user that has no up-to-date score"""
+    journal = []
+    for date, text in storage.query("journal_entries"):
+        digest = text_hash(text)
+        stored = storage.get(JOURNAL_SENTIMENT_STORE, date)
+        if stored is None or stored["hash"] != digest:
+            journal.append((date, text, digest))
+
+    moods = [
+        (date, entry)
+        for date, entry in storage.query("mood_entries")
+        if "sentiment_score" not in entry and entry.get("notes")
+    ]
+
+    results = score_batch([text for _, text, _ in journal] + [entry["notes"] for _, entry in moods], workers)
+
+    for (date, _, digest), result in zip(journal, results):
+        storage.put(JOURNAL_SENTIMENT_STORE, date, {"score": result, "hash": digest})
+    for (date, entry), result in zip(moods, results[len(journal):]):
+        storage.put("mood_entries", date, dict(entry, sentiment_score=result))
+
+    return len(journal), len(moods)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentiment scoring for Mental Health Companion Bot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = commands.add_parser("backfill", help="score existing journal entries and mood notes")
+    backfill_parser.add_argument("--user", default=DEFAULT_USER, help="user id (default: %(default)s)")
+    backfill_parser.add_argument("--all-users", action="store_true", help="backfill every user")
+    backfill_parser.add_argument("--workers", type=int, default=None, help="scoring processes")
+    args = parser.parse_args(argv)
+
+    users = list_users() if args.all_users else [args.user]
+    for user_id in users:
+        journal, moods = backfill(get_storage(user_id), args.workers)
+        print(f"{user_id}: scored {journal} journal entries and {moods} mood notes")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
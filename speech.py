@@ -0,0 +1,101 @@
+"""
+Speech-to-text for the Voice Assistant
+
+Audio comes from the server's microphone or from an uploaded file, and is
+transcribed by a pluggable engine: Google's web API, or CMU Sphinx, which runs
+offline (requires pocketsphinx). Transcription runs on a small worker pool;
+when all workers are busy requests wait in a bounded queue, and beyond that
+they are turned away instead of piling up.
+
+The ambient-noise calibration of the microphone is returned to the caller so
+it can be reused for the rest of the session instead of recalibrating on
+every recording.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import speech_recognition as sr
+
+# Engine name -> (label, Recognizer method)
+ENGINES = {
+    "google": ("Google (online)", "recognize_google"),
+    "sphinx": ("Sphinx (offline)", "recognize_sphinx"),
+}
+
+DEFAULT_ENGINE = os.environ.get("MHC_STT_ENGINE", "google")
+
+# File types sr.AudioFile can read
+AUDIO_TYPES = ["wav", "aif", "aiff", "flac"]
+
+STT_WORKERS = 2
+# Recognitions allowed to wait for a worker
+MAX_QUEUED = 8
+
+# Seconds to wait for speech to start, and for a transcription to finish
+LISTEN_TIMEOUT = 5
+RECOGNITION_TIMEOUT = 60
+
+CALIBRATION_SECONDS = 1
+
+_pool = ThreadPoolExecutor(max_workers=STT_WORKERS, thread_name_prefix="stt")
+_slots = threading.BoundedSemaphore(STT_WORKERS + MAX_QUEUED)
+
+
+class SpeechError(Exception):
+    """Audio could not be recorded or transcribed; the message is safe to show"""
+
+
+def listen(energy_threshold=None, timeout=LISTEN_TIMEOUT):
+    """Record one phrase from the microphone
+
+    Calibrates for ambient noise unless a threshold from an earlier
+    calibration is given. Returns the audio and the threshold used.
+    """
+    recognizer = sr.Recognizer()
+    with sr.Microphone() as source:
+        if energy_threshold is None:
+            recognizer.adjust_for_ambient_noise(source, duration=CALIBRATION_SECONDS)
+        else:
+            recognizer.energy_threshold = energy_threshold
+        audio = recognizer.listen(source, timeout=timeout)
+    return audio, recognizer.energy_threshold
+
+
+def read_audio_file(file):
+    """Load a WAV, AIFF or FLAC file (path or file object) as audio data"""
+    try:
+        with sr.AudioFile(file) as source:
+            return sr.Recognizer().record(source)
+    except (ValueError, EOFError) as error:
+        raise SpeechError(f"Could not read the audio file: {error}") from error
+
+
+def _transcribe(audio, engine):
+    recognize = getattr(sr.Recognizer(), ENGINES[engine][1])
+    try:
+        return recognize(audio)
+    except sr.UnknownValueError:
+        raise SpeechError("Sorry, the speech could not be understood. Please try again.")
+    except sr.RequestError as error:
+        raise SpeechError(f"Could not request results from the speech engine: {error}")
+
+
+def transcribe(audio, engine=DEFAULT_ENGINE, timeout=RECOGNITION_TIMEOUT):
+    """Transcribe audio on the worker pool and return the text"""
+    if engine not in ENGINES:
+        raise SpeechError(f"Unknown speech engine: {engine}")
+    if not _slots.acquire(blocking=False):
+        raise SpeechError("Too many recordings are being transcribed right now. Please try again shortly.")
+    try:
+        future = _pool.submit(_transcribe, audio, engine)
+    except RuntimeError:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout)
+    except FutureTimeout:
+        raise SpeechError("Transcription took too long. Please try a shorter recording.")
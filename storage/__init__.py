@@ -0,0 +1,113 @@
+"""
+Storage layer for Mental Health Companion Bot
+Journal and mood entries are persisted per user through process-wide storage objects
+"""
+
+import atexit
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from storage.base import Storage, freeze, json_default, subscribe
+from storage.jsonl import STORES, JsonlStorage
+from storage.sqlite import SqliteStorage
+
+__all__ = [
+    "DEFAULT_USER", "STORES", "SYSTEM_USER", "Storage", "JsonlStorage", "SqliteStorage",
+    "freeze", "get_storage", "json_default", "list_users", "subscribe", "user_data_dir",
+    "valid_user_id",
+]
+
+# Directory holding the data files, defaults to the working directory
+DATA_DIR = os.environ.get("MHC_DATA_DIR", ".")
+
+# Storage backend: "jsonl" (JSON snapshots plus append-only logs) or "sqlite"
+BACKEND = os.environ.get("MHC_STORAGE", "jsonl")
+
+BACKENDS = {
+    "jsonl": JsonlStorage,
+    "sqlite": SqliteStorage,
+}
+
+# The default user keeps its files directly in DATA_DIR, as before multi-user support
+DEFAULT_USER = "default"
+
+# Namespace for data that belongs to no single user (reminder jobs, indexes...);
+# it is not a valid profile name, so no session can open it as a user
+SYSTEM_USER = "_system"
+
+# Storage objects kept open at once; least recently used users are flushed and closed
+MAX_OPEN_USERS = 256
+
+_USER_ID = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}$")
+
+_storages = OrderedDict()
+_storage_lock = threading.Lock()
+
+
+def valid_user_id(user_id):
+    """Check that a user id is safe to use as a directory name"""
+    return user_id != SYSTEM_USER and bool(_USER_ID.match(user_id or ""))
+
+
+def user_data_dir(user_id):
+    """Return the data directory of a user
+
+    Users are sharded into 256 subdirectories by a hash of their id so that no
+    single directory ends up with thousands of entries.
+    """
+    if user_id == DEFAULT_USER:
+        return DATA_DIR
+    if user_id == SYSTEM_USER:
+        return os.path.join(DATA_DIR, "system")
+    if not valid_user_id(user_id):
+        raise ValueError(f"Invalid user id: {user_id!r}")
+    shard = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:2]
+    return os.path.join(DATA_DIR, "users", shard, user_id)
+
+
+def list_users():
+    """Return the ids of all users with a data directory
+
+    This walks the whole users/ tree and is meant for maintenance commands,
+    not for request handling.
+    """
+    users = [DEFAULT_USER]
+    root = os.path.join(DATA_DIR, "users")
+    if os.path.isdir(root):
+        for shard in sorted(os.listdir(root)):
+            shard_dir = os.path.join(root, shard)
+            if os.path.isdir(shard_dir):
+                users.extend(sorted(name for name in os.listdir(shard_dir) if valid_user_id(name)))
+    return users
+
+
+def get_storage(user_id=DEFAULT_USER):
+    """Return the storage of a user (or of SYSTEM_USER), shared by every session of this process"""
+    with _storage_lock:
+        storage = _storages.get(user_id)
+        if storage is not None:
+            _storages.move_to_end(user_id)
+            return storage
+
+        if BACKEND not in BACKENDS:
+            raise ValueError(f"Unknown storage backend: {BACKEND!r}")
+        storage = BACKENDS[BACKEND](user_data_dir(user_id))
+        storage.user_id = user_id
+        _storages[user_id] = storage
+
+        # Closing only releases file handles; the storage reopens them on the
+        # next write if a session still holds on to it
+        while len(_storages) > MAX_OPEN_USERS:
+            _, evicted = _storages.popitem(last=False)
+            evicted.close()
+        return storage
+
+
+@atexit.register
+def _close_all():
+    with _storage_lock:
+        for storage in _storages.values():
+            storage.close()
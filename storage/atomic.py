@@ -0,0 +1,51 @@
+"""
+Crash-safe file replacement
+
+Files are written to a temporary file next to the target, fsync'ed and then
+renamed over the target, so readers only ever see the old or the new content.
+The previous version is kept as a backup to recover from when the current
+file turns out to be unreadable.
+"""
+
+import itertools
+import os
+import threading
+
+_counter = itertools.count()
+
+
+def backup_path(path):
+    return path + ".bak"
+
+
+def fsync_dir(path):
+    """Make renames inside a directory durable"""
+    try:
+        fd = os.open(path or ".", os.O_RDONLY)
+    except OSError:  # Directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, data, keep_backup=True):
+    """Replace the contents of path with data (bytes) without ever truncating it"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Unique per write, so concurrent writers (threads or processes) never share a temp file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.{next(_counter)}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # If we crash between these renames the target is missing and readers
+    # fall back to the backup, which still holds the previous version
+    if keep_backup and os.path.exists(path):
+        os.replace(path, backup_path(path))
+    os.replace(tmp, path)
+    fsync_dir(directory)
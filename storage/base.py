@@ -0,0 +1,120 @@
+"""
+Interface shared by the storage backends
+
+Stores map a key to a JSON-serializable value. Journal and mood keys are
+timestamps ("%Y-%m-%d" or "%Y-%m-%d %H:%M"), which sort chronologically as
+plain strings, so key ranges double as date ranges.
+"""
+
+from types import MappingProxyType
+
+# Callbacks notified after every write, see subscribe()
+_listeners = []
+
+
+def subscribe(callback):
+    """Call callback(storage, store, key, old, new, before, after) after every write
+
+    old and new are the previous and the new value of the entry (None when it
+    did not exist or was deleted). After replace() the callback is invoked
+    once with key set to None. storage.user_id tells whose data changed.
+
+    before and after are the versions of the store just before and after the
+    change. A listener that keeps state derived from the store may only apply
+    the change if its state is at version `before`; otherwise it missed a write
+    (or already read this one) and must rebuild.
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def freeze(value):
+    """Return a read-only copy of a JSON value that sessions can safely share"""
+    if isinstance(value, MappingProxyType):
+        return value
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def json_default(value):
+    """json.dump fallback that serializes frozen mappings"""
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Storage:
+    """Base class for storage backends"""
+
+    # Set by get_storage() so listeners know whose data changed
+    user_id = None
+
+    def _notify(self, store, key, old, new, before, after):
+        for callback in _listeners:
+            callback(self, store, key, old, new, before, after)
+
+    def load(self, store):
+        """Return every entry of a store as a dict"""
+        raise NotImplementedError
+
+    def get(self, store, key, default=None):
+        """Return a single entry"""
+        raise NotImplementedError
+
+    def put(self, store, key, value):
+        """Add or replace a single entry"""
+        raise NotImplementedError
+
+    def put_many(self, store, entries):
+        """Add or replace many entries, given as (key, value) pairs
+
+        Backends write the batch at once; listeners are still notified of
+        every entry.
+        """
+        for key, value in entries:
+            self.put(store, key, value)
+
+    def delete(self, store, key):
+        """Remove a single entry if it exists"""
+        raise NotImplementedError
+
+    def replace(self, store, entries):
+        """Replace the whole store"""
+        raise NotImplementedError
+
+    def query(self, store, start=None, end=None, limit=None, reverse=False):
+        """Return (key, value) pairs with start <= key < end in key order"""
+        raise NotImplementedError
+
+    def count(self, store, start=None, end=None):
+        """Return the number of entries in a store, or of those with start <= key < end"""
+        raise NotImplementedError
+
+    def version(self, store):
+        """Return a number that changes whenever an entry is added, changed or removed"""
+        raise NotImplementedError
+
+    def keys(self, store, reverse=False):
+        """Return the keys of a store in key order"""
+        return [key for key, _ in self.query(store, reverse=reverse)]
+
+    def latest(self, store, n):
+        """Return the n most recent entries, newest first"""
+        return self.query(store, limit=n, reverse=True)
+
+    def clear(self, store):
+        """Remove every entry of a store"""
+        self.replace(store, {})
+
+    def cache_stats(self):
+        """Return cache hit/miss counters, or None if the backend has no cache"""
+        return None
+
+    def flush(self):
+        """Force pending writes to disk"""
+
+    def close(self):
+        """Release files and connections"""
@@ -0,0 +1,405 @@
+"""
+Append-only JSONL storage for journal and mood entries
+
+Each store keeps a JSON snapshot (e.g. mood_entries.json) plus an append-only
+log next to it (mood_entries.jsonl). Saving an entry appends a single record to
+the log, so the cost of a write does not depend on how much history exists.
+Once the log grows past the size of the snapshot it is folded back into the
+snapshot, which keeps loading fast and the amortized write cost constant.
+
+Parsed stores are cached for the lifetime of the process and shared by every
+session. The cache is validated against the mtime and size of the data files,
+so they are only parsed again when something else changes them on disk.
+Cached entries are frozen (read-only mappings) so that one session cannot
+accidentally modify the copy every other session sees.
+
+Writes hold an inter-process lock on the data directory and re-validate the
+cache before appending, so concurrent writers never lose each other's records.
+
+Snapshots are replaced atomically (temp file, fsync, rename) and the previous
+snapshot is kept as a backup. Every log starts with a header carrying the
+checksum of the snapshot it extends, so a log left behind by an interrupted
+compaction is recognised as stale instead of being replayed twice. A torn
+record at the end of the log is skipped on load.
+"""
+
+import bisect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+
+from types import MappingProxyType
+
+from storage.atomic import atomic_write, backup_path
+from storage.base import Storage, freeze, json_default
+from storage.locks import FileLock
+
+logger = logging.getLogger(__name__)
+
+# Stores managed by the application
+STORES = ("journal_entries", "mood_entries")
+
+# Log records are only fsync'ed in batches; a crash can lose at most this many
+# records or this many seconds of writes, whichever comes first
+FSYNC_EVERY = 16
+FSYNC_INTERVAL = 2.0
+
+# Never compact logs smaller than this, even for tiny snapshots
+MIN_COMPACT_RECORDS = 256
+
+# put_many() batches larger than this rebuild the sorted key list instead of inserting into it
+BULK_RESORT = 64
+
+LOCK_FILE = ".storage.lock"
+
+# Data versions are drawn from one process-wide counter so that a store never
+# reuses a version number, even after being re-read from disk
+_versions = itertools.count(1)
+
+
+class JsonlStorage(Storage):
+    """Snapshot plus append-only log storage rooted at a data directory"""
+
+    def __init__(self, data_dir=".", fsync_every=FSYNC_EVERY,
+                 fsync_interval=FSYNC_INTERVAL, min_compact_records=MIN_COMPACT_RECORDS):
+        self.data_dir = data_dir
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.min_compact_records = min_compact_records
+
+        # Readers only need the in-process lock; writers take the file lock first
+        self._lock = threading.RLock()
+        self._write_lock = FileLock(os.path.join(data_dir, LOCK_FILE))
+        self._entries = {}
+        self._views = {}
+        self._stamps = {}
+        self._snapshot_crcs = {}
+        self._stale_logs = set()
+        self._versions = {}
+        self._sorted_keys = {}
+        self._log_records = {}
+        self._snapshot_sizes = {}
+        self._log_files = {}
+        self._unsynced = {}
+        self._last_sync = {}
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot_path(self, store):
+        return os.path.join(self.data_dir, f"{store}.json")
+
+    def log_path(self, store):
+        return os.path.join(self.data_dir, f"{store}.jsonl")
+
+    # Reading
+
+    def load(self, store):
+        """Return a read-only view of the entries of a store"""
+        with self._lock:
+            self._entries_for(store)
+            return self._views[store]
+
+    def _entries_for(self, store):
+        # Parse the store only if it was never read or changed on disk since
+        stamp = self._stamp(store)
+        if store in self._entries and self._stamps.get(store) == stamp:
+            self.hits += 1
+            return self._entries[store]
+
+        self.misses += 1
+        self._close_log(store)
+        self._entries[store], self._log_records[store] = self._read(store)
+        self._views[store] = MappingProxyType(self._entries[store])
+        self._stamps[store] = stamp
+        self._versions[store] = next(_versions)
+        self._sorted_keys.pop(store, None)
+        return self._entries[store]
+
+    def _stamp(self, store):
+        stamp = []
+        for path in (self.snapshot_path(store), self.log_path(store)):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stamp.append(None)
+            else:
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamp)
+
+    def cache_stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def get(self, store, key, default=None):
+        with self._lock:
+            return self._entries_for(store).get(key, default)
+
+    def count(self, store, start=None, end=None):
+        with self._lock:
+            entries = self._entries_for(store)
+            if start is None and end is None:
+                return len(entries)
+            keys = self._keys(store)
+            lo = 0 if start is None else bisect.bisect_left(keys, start)
+            hi = len(keys) if end is None else bisect.bisect_left(keys, end)
+            return max(0, hi - lo)
+
+    def version(self, store):
+        with self._lock:
+            self._entries_for(store)
+            return self._versions[store]
+
+    def query(self, store, start=None, end=None, limit=None, reverse=False):
+        with self._lock:
+            entries = self._entries_for(store)
+            keys = self._keys(store)
+            lo = 0 if start is None else bisect.bisect_left(keys, start)
+            hi = len(keys) if end is None else bisect.bisect_left(keys, end)
+            # Narrow the bounds to the limit first, so only the returned keys are copied
+            if limit is not None:
+                if reverse:
+                    lo = max(lo, hi - limit)
+                else:
+                    hi = min(hi, lo + limit)
+            selected = keys[lo:hi]
+            if reverse:
+                selected.reverse()
+            return [(key, entries[key]) for key in selected]
+
+    def _keys(self, store):
+        # Sorted key list, maintained incrementally by _append
+        if store not in self._sorted_keys:
+            self._sorted_keys[store] = sorted(self._entries[store])
+        return self._sorted_keys[store]
+
+    def _read(self, store):
+        entries, crc = self._read_snapshot(store)
+        self._snapshot_crcs[store] = crc
+        self._snapshot_sizes[store] = len(entries)
+        self._stale_logs.discard(store)
+
+        records = 0
+        log = self.log_path(store)
+        if os.path.exists(log):
+            with open(log, "r") as f:
+                for number, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line, object_hook=MappingProxyType)
+                    except ValueError:
+                        # Torn write from a crash; the record was never acknowledged
+                        logger.warning("Skipping unreadable record %s:%d", log, number)
+                        continue
+                    if record["op"] == "base":
+                        if record["crc"] != crc:
+                            logger.warning("Ignoring stale log %s", log)
+                            self._stale_logs.add(store)
+                            break
+                        continue
+                    self._apply(entries, record)
+                    records += 1
+
+        return entries, records
+
+    def _read_snapshot(self, store):
+        """Return the entries and checksum of the snapshot, or of its backup if it is unreadable"""
+        snapshot = self.snapshot_path(store)
+        for path in (snapshot, backup_path(snapshot)):
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                entries = json.loads(data, object_hook=MappingProxyType)
+            except FileNotFoundError:
+                continue
+            except ValueError:
+                logger.warning("Snapshot %s is corrupt, falling back to the backup", path)
+                continue
+            return dict(entries), zlib.crc32(data)
+
+        if os.path.exists(snapshot):
+            raise ValueError(f"Neither {snapshot} nor its backup could be read")
+        return {}, None
+
+    @staticmethod
+    def _apply(entries, record):
+        op = record["op"]
+        if op == "put":
+            entries[record["key"]] = freeze(record["value"])
+        elif op == "del":
+            entries.pop(record["key"], None)
+        elif op == "clear":
+            entries.clear()
+
+    # Writing
+
+    def put(self, store, key, value):
+        """Add or replace a single entry"""
+        self._append(store, {"op": "put", "key": key, "value": value})
+
+    def put_many(self, store, entries):
+        """Add or replace many entries with a single write to the log"""
+        records = [{"op": "put", "key": key, "value": value} for key, value in entries]
+        if not records:
+            return
+        with self._write_lock, self._lock:
+            stored = self._entries_for(store)
+            if len(records) > BULK_RESORT:
+                # Re-sorting once is cheaper than inserting every key
+                self._sorted_keys.pop(store, None)
+            # Each record gets its own version, so listeners can follow the batch entry by entry
+            changes = []
+            for record in records:
+                old = stored.get(record["key"])
+                self._update_keys(store, stored, record)
+                self._apply(stored, record)
+                before, self._versions[store] = self._versions[store], next(_versions)
+                changes.append((record["key"], old, stored[record["key"]], before, self._versions[store]))
+
+            f = self._log_file(store)
+            f.write("".join(json.dumps(record, default=json_default) + "\n" for record in records))
+            f.flush()
+            self._stamps[store] = self._stamp(store)
+            self._log_records[store] += len(records)
+            self._unsynced[store] = self._unsynced.get(store, 0) + len(records)
+
+            if self._log_full(store):
+                self.compact(store)
+            else:
+                self._sync(store)
+
+            for key, old, new, before, after in changes:
+                self._notify(store, key, old, new, before, after)
+
+    def delete(self, store, key):
+        """Remove a single entry if it exists"""
+        self._append(store, {"op": "del", "key": key})
+
+    def replace(self, store, entries):
+        """Replace the whole store, e.g. when clearing all data"""
+        with self._write_lock, self._lock:
+            before = self._versions.get(store)
+            self._entries[store] = {key: freeze(value) for key, value in entries.items()}
+            self._views[store] = MappingProxyType(self._entries[store])
+            self._versions[store] = next(_versions)
+            self._sorted_keys.pop(store, None)
+            self._write_snapshot(store)
+            self._notify(store, None, None, None, before, self._versions[store])
+
+    def _append(self, store, record):
+        with self._write_lock, self._lock:
+            entries = self._entries_for(store)
+            if record["op"] == "del" and record["key"] not in entries:
+                return  # Nothing to delete; like SQLite, neither logged nor notified
+            old = entries.get(record["key"])
+            self._update_keys(store, entries, record)
+            self._apply(entries, record)
+            before, self._versions[store] = self._versions[store], next(_versions)
+
+            f = self._log_file(store)
+            f.write(json.dumps(record, default=json_default) + "\n")
+            f.flush()
+            self._stamps[store] = self._stamp(store)
+            self._log_records[store] += 1
+            self._unsynced[store] = self._unsynced.get(store, 0) + 1
+
+            if self._log_full(store):
+                self.compact(store)
+            elif (self._unsynced[store] >= self.fsync_every
+                  or time.monotonic() - self._last_sync.get(store, 0) >= self.fsync_interval):
+                self._sync(store)
+
+            # Still under the lock, so listeners see writes in order
+            self._notify(store, record["key"], old, entries.get(record["key"]), before, self._versions[store])
+
+    def _log_full(self, store):
+        # Compare with the snapshot the log extends, not the store: a log of
+        # inserts only never outgrows the store it keeps adding to
+        return self._log_records[store] >= max(self.min_compact_records, self._snapshot_sizes[store])
+
+    def _update_keys(self, store, entries, record):
+        keys = self._sorted_keys.get(store)
+        if keys is None:
+            return
+        key = record.get("key")
+        if record["op"] == "put" and key not in entries:
+            bisect.insort(keys, key)
+        elif record["op"] == "del" and key in entries:
+            del keys[bisect.bisect_left(keys, key)]
+        elif record["op"] == "clear":
+            keys.clear()
+
+    def _log_file(self, store):
+        f = self._log_files.get(store)
+        if f is None:
+            os.makedirs(self.data_dir, exist_ok=True)
+            path = self.log_path(store)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size == 0 or store in self._stale_logs:
+                # Start a new log tied to the snapshot it extends
+                f = open(path, "w")
+                f.write(json.dumps({"op": "base", "crc": self._snapshot_crcs.get(store)}) + "\n")
+                self._stale_logs.discard(store)
+            else:
+                # Terminate a torn record left by a crash so the next one starts on its own line
+                with open(path, "rb") as tail:
+                    tail.seek(-1, os.SEEK_END)
+                    torn = tail.read(1) != b"\n"
+                f = open(path, "a")
+                if torn:
+                    f.write("\n")
+            self._log_files[store] = f
+            self._last_sync[store] = time.monotonic()
+        return f
+
+    def _close_log(self, store):
+        f = self._log_files.pop(store, None)
+        if f is not None:
+            f.close()
+
+    def _sync(self, store):
+        f = self._log_files.get(store)
+        if f is not None and self._unsynced.get(store):
+            f.flush()
+            os.fsync(f.fileno())
+        self._unsynced[store] = 0
+        self._last_sync[store] = time.monotonic()
+
+    # Maintenance
+
+    def compact(self, store):
+        """Fold the log into the snapshot and start a new, empty log"""
+        with self._write_lock, self._lock:
+            self._entries_for(store)
+            self._write_snapshot(store)
+
+    def _write_snapshot(self, store):
+        data = json.dumps(self._entries[store], default=json_default).encode("utf-8")
+        atomic_write(self.snapshot_path(store), data)
+        self._snapshot_crcs[store] = zlib.crc32(data)
+        self._snapshot_sizes[store] = len(self._entries[store])
+
+        # The snapshot now contains everything in the log; if we crash before
+        # removing it, its header no longer matches and it is ignored
+        self._close_log(store)
+        if os.path.exists(self.log_path(store)):
+            os.remove(self.log_path(store))
+        self._log_records[store] = 0
+        self._unsynced[store] = 0
+        self._stamps[store] = self._stamp(store)
+
+    def flush(self):
+        """Force all pending log records to disk"""
+        with self._lock:
+            for store in list(self._log_files):
+                self._sync(store)
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            for f in self._log_files.values():
+                f.close()
+            self._log_files.clear()
@@ -0,0 +1,235 @@
+"""
+SQLite storage backend
+
+Every store is a table keyed by its timestamp key, so "latest N", date range
+and delete operations are index lookups instead of scans over the whole
+history. The database runs in WAL mode so readers never block the writer.
+Existing JSON data files are migrated into the database on first start.
+Every user has their own database file, and each write runs in its own
+transaction so concurrent sessions never see partial updates.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from storage.base import Storage, json_default
+from storage.jsonl import STORES, JsonlStorage
+
+DB_FILE = "mental_health.db"
+
+# Bound parameters per statement, below SQLite's default limit
+MAX_PARAMS = 500
+
+_STORE_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+class SqliteStorage(Storage):
+    """Storage backed by a single SQLite database in WAL mode"""
+
+    def __init__(self, data_dir=".", db_file=DB_FILE):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, db_file)
+        self._local = threading.local()
+        self._tables = set()
+        self._tables_lock = threading.Lock()
+
+        os.makedirs(data_dir, exist_ok=True)
+        conn = self._connect()
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        for store in STORES:
+            self._migrate(store)
+
+    def _connect(self):
+        # sqlite3 connections cannot be shared between threads, and Streamlit
+        # runs every session in its own thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _table(self, store):
+        """Return the quoted table name of a store, creating the table if needed"""
+        if not _STORE_NAME.match(store):
+            raise ValueError(f"Invalid store name: {store!r}")
+        table = f'"{store}"'
+        if store not in self._tables:
+            with self._tables_lock:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        f"CREATE TABLE IF NOT EXISTS {table} "
+                        "(key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+                    )
+                self._tables.add(store)
+        return table
+
+    def _migrate(self, store):
+        """Import the JSON snapshot and log of a store the first time we see it"""
+        conn = self._connect()
+        table = self._table(store)
+        marker = f"migrated:{store}"
+        if conn.execute("SELECT 1 FROM meta WHERE key = ?", (marker,)).fetchone():
+            return
+
+        legacy = JsonlStorage(self.data_dir)
+        entries = legacy.load(store)
+        legacy.close()
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (key, value) VALUES (?, ?)",
+                ((key, json.dumps(value, default=json_default)) for key, value in entries.items())
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (marker, str(len(entries))))
+
+    # Reading
+
+    def load(self, store):
+        rows = self._connect().execute(f"SELECT key, value FROM {self._table(store)}")
+        return {key: json.loads(value) for key, value in rows}
+
+    def get(self, store, key, default=None):
+        value = self._get(self._connect(), self._table(store), key)
+        return default if value is None else value
+
+    def count(self, store, start=None, end=None):
+        sql = f"SELECT COUNT(*) FROM {self._table(store)}"
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("key >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("key < ?")
+            params.append(end)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return self._connect().execute(sql, params).fetchone()[0]
+
+    def version(self, store):
+        self._table(store)
+        row = self._connect().execute(
+            "SELECT value FROM meta WHERE key = ?", (f"version:{store}",)
+        ).fetchone()
+        return 0 if row is None else int(row[0])
+
+    def _bump_version(self, conn, store, changes=1):
+        # Runs inside the writing transaction, so other processes see the new
+        # version together with the change. Returns the new version
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+            (f"version:{store}", changes)
+        )
+        return int(conn.execute("SELECT value FROM meta WHERE key = ?", (f"version:{store}",)).fetchone()[0])
+
+    def query(self, store, start=None, end=None, limit=None, reverse=False):
+        sql = f"SELECT key, value FROM {self._table(store)}"
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("key >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("key < ?")
+            params.append(end)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY key DESC" if reverse else " ORDER BY key"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self._connect().execute(sql, params)
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def keys(self, store, reverse=False):
+        order = "DESC" if reverse else "ASC"
+        rows = self._connect().execute(f"SELECT key FROM {self._table(store)} ORDER BY key {order}")
+        return [key for (key,) in rows]
+
+    # Writing
+
+    @staticmethod
+    def _begin(conn):
+        # sqlite3 only opens the transaction at the first write statement; take
+        # the write lock up front so the old values read for listeners cannot
+        # be replaced by another writer before this write commits
+        conn.execute("BEGIN IMMEDIATE")
+
+    def put(self, store, key, value):
+        conn = self._connect()
+        table = self._table(store)
+        with conn:
+            self._begin(conn)
+            old = self._get(conn, table, key)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, default=json_default))
+            )
+            version = self._bump_version(conn, store)
+        self._notify(store, key, old, value, version - 1, version)
+
+    def put_many(self, store, entries):
+        entries = list(entries)
+        conn = self._connect()
+        table = self._table(store)
+        with conn:
+            self._begin(conn)
+            old = {}
+            keys = [key for key, _ in entries]
+            for i in range(0, len(keys), MAX_PARAMS):
+                chunk = keys[i:i + MAX_PARAMS]
+                rows = conn.execute(
+                    f"SELECT key, value FROM {table} WHERE key IN ({', '.join('?' * len(chunk))})", chunk)
+                old.update((key, json.loads(value)) for key, value in rows)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (key, value) VALUES (?, ?)",
+                ((key, json.dumps(value, default=json_default)) for key, value in entries)
+            )
+            # One version per entry, so listeners can follow the batch entry by entry
+            version = self._bump_version(conn, store, len(entries)) - len(entries)
+        for key, value in entries:
+            version += 1
+            # A key given twice replaces the value of its first occurrence
+            self._notify(store, key, old.get(key), value, version - 1, version)
+            old[key] = value
+
+    def delete(self, store, key):
+        conn = self._connect()
+        table = self._table(store)
+        with conn:
+            self._begin(conn)
+            old = self._get(conn, table, key)
+            if old is None:
+                return
+            conn.execute(f"DELETE FROM {table} WHERE key = ?", (key,))
+            version = self._bump_version(conn, store)
+        self._notify(store, key, old, None, version - 1, version)
+
+    @staticmethod
+    def _get(conn, table, key):
+        row = conn.execute(f"SELECT value FROM {table} WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def replace(self, store, entries):
+        conn = self._connect()
+        table = self._table(store)
+        with conn:
+            self._begin(conn)
+            conn.execute(f"DELETE FROM {table}")
+            conn.executemany(
+                f"INSERT INTO {table} (key, value) VALUES (?, ?)",
+                ((key, json.dumps(value, default=json_default)) for key, value in entries.items())
+            )
+            version = self._bump_version(conn, store)
+        self._notify(store, None, None, None, version - 1, version)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
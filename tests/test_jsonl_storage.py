@@ -0,0 +1,76 @@
+"""
+Tests for the append-only JSONL storage
+
+    python -m unittest discover tests
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage.jsonl import JsonlStorage  # noqa: E402
+
+
+class CompactionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = JsonlStorage(self.tmp.name, min_compact_records=4)
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def log_lines(self, store):
+        path = self.storage.log_path(store)
+        if not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            # Not counting the header
+            return sum(1 for line in f if line.strip()) - 1
+
+    def snapshot_size(self, store):
+        path = self.storage.snapshot_path(store)
+        if not os.path.exists(path):
+            return 0
+        with open(path) as f:
+            return len(json.load(f))
+
+    def test_inserts_only_are_compacted(self):
+        # The log used to be compared with the whole store, which grows with
+        # every insert, so a store that was only ever added to never compacted
+        for i in range(100):
+            self.storage.put("mood_entries", f"2024-01-01 {i:04d}", {"mood": "Good"})
+        self.assertLessEqual(self.log_lines("mood_entries"), max(4, self.snapshot_size("mood_entries")))
+        self.assertEqual(self.storage.count("mood_entries"), 100)
+
+    def test_put_many_inserts_are_compacted(self):
+        for batch in range(20):
+            self.storage.put_many("mood_entries", [(f"2024-01-{batch:02d} {i}", {"mood": "Good"}) for i in range(3)])
+        self.assertLessEqual(self.log_lines("mood_entries"), max(4, self.snapshot_size("mood_entries")) + 2)
+        self.assertEqual(self.storage.count("mood_entries"), 60)
+
+    def test_log_grows_to_the_snapshot_size(self):
+        self.storage.put_many("mood_entries", [(f"2024-01-01 {i:02d}", {"mood": "Good"}) for i in range(10)])
+        self.storage.compact("mood_entries")
+        for i in range(9):
+            self.storage.put("mood_entries", f"2024-01-02 {i:02d}", {"mood": "Bad"})
+        self.assertEqual(self.log_lines("mood_entries"), 9)
+        self.storage.put("mood_entries", "2024-01-03 00", {"mood": "Bad"})
+        self.assertEqual(self.log_lines("mood_entries"), 0)
+        self.assertEqual(self.snapshot_size("mood_entries"), 20)
+
+    def test_reload_after_compaction(self):
+        for i in range(50):
+            self.storage.put("journal_entries", f"2024-02-{i:02d}", f"entry {i}")
+        reloaded = JsonlStorage(self.tmp.name, min_compact_records=4)
+        self.assertEqual(dict(reloaded.load("journal_entries")), dict(self.storage.load("journal_entries")))
+        reloaded.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests that the JSONL and SQLite backends behave the same
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import base  # noqa: E402
+from storage.jsonl import JsonlStorage  # noqa: E402
+from storage.sqlite import SqliteStorage  # noqa: E402
+
+KEYS = [f"2024-01-{day:02d} 10:00" for day in range(1, 11)]
+
+
+class BackendTests:
+    """Cases run against every backend; subclasses set make_storage"""
+
+    def make_storage(self, data_dir):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = self.make_storage(self.tmp.name)
+        self.changes = []
+        base._listeners.append(self.record)
+
+    def tearDown(self):
+        base._listeners.remove(self.record)
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def record(self, storage, store, key, old, new, before, after):
+        if storage is self.storage:
+            self.changes.append((store, key, _plain(old), _plain(new), before, after))
+
+    def fill(self):
+        self.storage.put_many("mood_entries", [(key, {"mood": "Good", "n": i}) for i, key in enumerate(KEYS)])
+        self.changes.clear()
+
+    def keys(self, rows):
+        return [key for key, _ in rows]
+
+    def test_query_range_limit_and_reverse(self):
+        self.fill()
+        query = self.storage.query
+        self.assertEqual(self.keys(query("mood_entries")), KEYS)
+        self.assertEqual(self.keys(query("mood_entries", limit=3)), KEYS[:3])
+        self.assertEqual(self.keys(query("mood_entries", limit=3, reverse=True)), KEYS[::-1][:3])
+        self.assertEqual(self.keys(query("mood_entries", KEYS[2], KEYS[7])), KEYS[2:7])
+        self.assertEqual(self.keys(query("mood_entries", KEYS[2], KEYS[7], limit=2, reverse=True)), [KEYS[6], KEYS[5]])
+        self.assertEqual(self.keys(query("mood_entries", KEYS[2], KEYS[7], limit=0)), [])
+        self.assertEqual(self.keys(query("mood_entries", "2024-01-05", limit=100)), KEYS[4:])
+        self.assertEqual(self.keys(self.storage.latest("mood_entries", 2)), [KEYS[9], KEYS[8]])
+        self.assertEqual(self.storage.count("mood_entries"), 10)
+        self.assertEqual(self.storage.count("mood_entries", KEYS[2], KEYS[7]), 5)
+        self.assertEqual(self.storage.count("mood_entries", "2024-02"), 0)
+
+    def test_put_many_notifies_every_entry_in_order(self):
+        self.fill()
+        start = self.storage.version("mood_entries")
+        self.storage.put_many("mood_entries", [
+            (KEYS[0], {"mood": "Bad"}),
+            ("2024-02-01 10:00", {"mood": "Neutral"}),
+            (KEYS[0], {"mood": "Excellent"}),  # The same key again replaces the value just written
+        ])
+        self.assertEqual([(key, old, new) for _, key, old, new, _, _ in self.changes], [
+            (KEYS[0], {"mood": "Good", "n": 0}, {"mood": "Bad"}),
+            ("2024-02-01 10:00", None, {"mood": "Neutral"}),
+            (KEYS[0], {"mood": "Bad"}, {"mood": "Excellent"}),
+        ])
+        self.assertEqual(_plain(self.storage.get("mood_entries", KEYS[0])), {"mood": "Excellent"})
+        self.assertEqual(self.storage.count("mood_entries"), 11)
+        self.assert_versions_chain(start)
+
+    def test_put_and_delete(self):
+        self.fill()
+        start = self.storage.version("mood_entries")
+        self.storage.put("mood_entries", KEYS[1], {"mood": "Bad"})
+        self.storage.delete("mood_entries", KEYS[2])
+        self.storage.delete("mood_entries", "2030-01-01 00:00")  # Missing keys are ignored
+        self.assertIsNone(self.storage.get("mood_entries", KEYS[2]))
+        self.assertEqual(self.storage.count("mood_entries"), 9)
+        self.assertNotIn(KEYS[2], self.keys(self.storage.query("mood_entries")))
+        self.assertEqual([(key, old, new) for _, key, old, new, _, _ in self.changes], [
+            (KEYS[1], {"mood": "Good", "n": 1}, {"mood": "Bad"}),
+            (KEYS[2], {"mood": "Good", "n": 2}, None),
+        ])
+        self.assert_versions_chain(start)
+
+    def test_replace_notifies_once(self):
+        self.fill()
+        start = self.storage.version("mood_entries")
+        self.storage.replace("mood_entries", {KEYS[0]: {"mood": "Bad"}})
+        self.assertEqual([(store, key) for store, key, _, _, _, _ in self.changes], [("mood_entries", None)])
+        self.assertEqual(self.changes[0][4], start)
+        self.assertEqual(self.changes[0][5], self.storage.version("mood_entries"))
+        self.assertEqual(self.keys(self.storage.query("mood_entries")), [KEYS[0]])
+
+    def assert_versions_chain(self, start):
+        # Each change starts at the version the previous one ended at, and the
+        # last one ends at the store's current version
+        version = start
+        for _, key, _, _, before, after in self.changes:
+            self.assertEqual(before, version, key)
+            self.assertNotEqual(after, before, key)
+            version = after
+        self.assertEqual(version, self.storage.version("mood_entries"))
+
+
+class JsonlBackendTest(BackendTests, unittest.TestCase):
+
+    def make_storage(self, data_dir):
+        return JsonlStorage(data_dir)
+
+
+class SqliteBackendTest(BackendTests, unittest.TestCase):
+
+    def make_storage(self, data_dir):
+        return SqliteStorage(data_dir)
+
+
+def _plain(value):
+    """Frozen JSONL values as plain dicts, for comparison"""
+    return None if value is None else dict(value) if not isinstance(value, str) else value
+
+
+if __name__ == "__main__":
+    unittest.main()
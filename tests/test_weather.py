@@ -0,0 +1,101 @@
+"""
+Tests for the weather client against the local stub server (benchmarks/mock_weather.py)
+
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import mock_weather  # noqa: E402
+import weather  # noqa: E402
+
+# Longest wait for the background refresher, in seconds
+REFRESH_WAIT = 5
+
+
+class WeatherClientTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server, base_url, icon_url = mock_weather.start_server()
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.saved = weather.WEATHER_BASE_URL, weather.WEATHER_ICON_URL, weather.ICON_DIR
+        weather.WEATHER_BASE_URL, weather.WEATHER_ICON_URL = base_url, icon_url
+        weather.ICON_DIR = cls.tmp.name
+
+    @classmethod
+    def tearDownClass(cls):
+        weather.WEATHER_BASE_URL, weather.WEATHER_ICON_URL, weather.ICON_DIR = cls.saved
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        weather._observations.clear()
+
+    def requests_made(self):
+        return self.server.weather_requests
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + REFRESH_WAIT
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("the refresher did not fetch the weather in time")
+            time.sleep(0.02)
+
+    def test_fetch_weather(self):
+        observation = weather.fetch_weather("oslo", "key")
+        self.assertEqual(observation["city"], "Oslo")
+        self.assertEqual(observation["temp"], 18.5)
+        self.assertEqual(observation["humidity"], 64.0)
+        self.assertEqual(observation["condition"], "Clouds")
+        self.assertTrue(os.path.exists(weather.icon_path(observation["icon"])))
+
+    def test_cache_hit_within_ttl(self):
+        first = weather.get_weather("Bergen", "key")
+        requests = self.requests_made()
+        self.assertIs(weather.get_weather("  bergen ", "key"), first)
+        self.assertEqual(self.requests_made(), requests)
+
+    def test_stale_observation_is_served_and_refreshed(self):
+        stale = dict(weather.get_weather("Tromso", "key"), fetched=time.time() - weather.WEATHER_TTL - 1)
+        weather._observations.set("tromso", stale)
+
+        self.assertIs(weather.get_weather("Tromso", "key", wait=False), stale)
+        self.wait_for(lambda: weather._observations.get("tromso") is not stale)
+        self.assertGreater(weather._observations.get("tromso")["fetched"], stale["fetched"])
+
+    def test_miss_without_waiting_queues_a_fetch(self):
+        self.assertIsNone(weather.get_weather("Stavanger", "key", wait=False))
+        self.wait_for(lambda: weather._observations.get("stavanger") is not None)
+
+    def test_malformed_payload_raises_weather_error(self):
+        with self.assertRaises(weather.WeatherError):
+            weather.fetch_weather("Oslo", "malformed")
+        with self.assertRaises(weather.WeatherError):
+            weather.get_weather("Oslo", "malformed")
+
+    def test_rejected_key_raises_weather_error(self):
+        with self.assertRaisesRegex(weather.WeatherError, "Invalid API key"):
+            weather.get_weather("Oslo", "invalid")
+
+    def test_refresher_survives_malformed_payloads(self):
+        self.assertIsNone(weather.get_weather("Nowhere", "malformed", wait=False))
+        requests = self.requests_made()
+        self.wait_for(lambda: self.requests_made() > requests)
+        # Still running: a later miss is fetched
+        self.assertIsNone(weather.get_weather("Drammen", "key", wait=False))
+        self.wait_for(lambda: weather._observations.get("drammen") is not None)
+        self.assertTrue(weather.refresher._thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+Text-to-speech for the Voice Assistant
+
+Speech is synthesized with pyttsx3 into audio files by a single background
+worker, which owns the (not thread-safe) engine. Files are stored in a
+content-addressed cache keyed by the text and the voice settings, so a phrase
+that was spoken before, like the assistant's canned responses, is served from
+disk without synthesizing it again. Identical requests in flight share one
+synthesis.
+
+The cache is pruned by the worker after every synthesis: files not used for
+TTS_CACHE_MAX_AGE are removed, then the least recently used ones until the
+cache fits in TTS_CACHE_MAX_BYTES, so the text users have spoken is not kept
+for ever.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from storage import DATA_DIR
+
+TTS_CACHE_DIR = os.path.join(DATA_DIR, "cache", "tts")
+
+# Size and age limits of the audio cache; a file's mtime is its last use
+TTS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+TTS_CACHE_MAX_AGE = 7 * 24 * 3600
+
+DEFAULT_RATE = 175
+DEFAULT_VOLUME = 1.0
+
+# Longest wait for a synthesis, in seconds
+SYNTHESIS_TIMEOUT = 30
+
+# Synthesis requests allowed to wait for the worker
+MAX_QUEUED = 32
+
+
+class SpeechSynthesisError(Exception):
+    """Speech could not be synthesized; the message is safe to show"""
+
+
+def cache_key(text, rate=DEFAULT_RATE, voice=None, volume=DEFAULT_VOLUME):
+    settings = json.dumps([text, rate, voice, volume], ensure_ascii=False)
+    return hashlib.sha1(settings.encode("utf-8")).hexdigest()
+
+
+def cache_path(key):
+    return os.path.join(TTS_CACHE_DIR, key[:2], f"{key}.wav")
+
+
+def prune_cache(max_bytes=TTS_CACHE_MAX_BYTES, max_age=TTS_CACHE_MAX_AGE):
+    """Remove cached audio older than max_age, then the least recently used until under max_bytes"""
+    files = []
+    for directory, _, names in os.walk(TTS_CACHE_DIR):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    cutoff = time.time() - max_age
+    total = sum(size for _, size, _ in files)
+    for mtime, size, path in sorted(files):
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+class SpeechWorker:
+    """Background thread synthesizing queued phrases one at a time on its own engine"""
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=MAX_QUEUED)
+        self._pending = {}  # cache key -> Future of the file being synthesized
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, text, rate=DEFAULT_RATE, voice=None, volume=DEFAULT_VOLUME):
+        """Return a Future for the audio file of text, synthesizing it unless cached"""
+        key = cache_key(text, rate, voice, volume)
+        path = cache_path(key)
+        if os.path.exists(path):
+            try:
+                os.utime(path)  # Mark it used, so pruning keeps it
+            except OSError:
+                pass
+            future = Future()
+            future.set_result(path)
+            return future
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            job = functools.partial(self._synthesize, path=path, text=text, rate=rate, voice=voice, volume=volume)
+            future = self._enqueue(key, job)
+            if not future.done():
+                self._pending[key] = future
+            return future
+
+    def _enqueue(self, key, job):
+        # Called with self._lock held
+        future = Future()
+        try:
+            self._queue.put_nowait((key, job, future))
+        except queue.Full:
+            future.set_exception(SpeechSynthesisError("Speech synthesis is busy. Please try again shortly."))
+            return future
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+            self._thread.start()
+        return future
+
+    def _run(self):
+        engine, error = None, None
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+        except Exception as e:  # pyttsx3 raises whatever its driver raises
+            error = SpeechSynthesisError(f"Text-to-speech is not available on this server: {e}")
+
+        while True:
+            key, job, future = self._queue.get()
+            if error:
+                future.set_exception(error)
+            else:
+                try:
+                    future.set_result(job(engine))
+                except Exception as e:
+                    future.set_exception(SpeechSynthesisError(f"Could not synthesize speech: {e}"))
+            with self._lock:
+                self._pending.pop(key, None)
+            try:
+                prune_cache()
+            except OSError:
+                pass  # Pruning is retried after the next synthesis
+
+    @staticmethod
+    def _synthesize(engine, path, text, rate, voice, volume):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.wav"
+        engine.setProperty("rate", rate)
+        engine.setProperty("volume", volume)
+        if voice:
+            engine.setProperty("voice", voice)
+        engine.save_to_file(text, tmp)
+        engine.runAndWait()
+        if not os.path.exists(tmp) or not os.path.getsize(tmp):
+            raise SpeechSynthesisError("the engine produced no audio")
+        os.replace(tmp, path)
+        return path
+
+
+worker = SpeechWorker()
+
+
+def synthesize(text, rate=DEFAULT_RATE, voice=None, volume=DEFAULT_VOLUME, timeout=SYNTHESIS_TIMEOUT):
+    """Return the path of a WAV file speaking text"""
+    future = worker.submit(text, rate, voice, volume)
+    try:
+        return future.result(timeout)
+    except FutureTimeout:
+        raise SpeechSynthesisError("Speech synthesis took too long.")
+
+
+def prefetch(texts, rate=DEFAULT_RATE, voice=None, volume=DEFAULT_VOLUME):
+    """Synthesize phrases in the background so they are cached when first needed"""
+    for text in texts:
+        worker.submit(text, rate, voice, volume)
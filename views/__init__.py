@@ -0,0 +1,21 @@
+"""
+Page handlers for Mental Health Companion Bot
+Each module exposes render(storage), called by app.py for the selected page.
+
+Page modules are only imported when their page is opened, so heavy
+dependencies (pandas, matplotlib, requests, speech recognition...) are not
+loaded for pages that don't use them.
+"""
+
+PAGES = {
+    "Dashboard": "views.dashboard",
+    "Guided Breathing": "views.breathing",
+    "Daily Journal": "views.journal",
+    "Mood Tracker": "views.mood_tracker",
+    "Mood Analytics": "views.analytics",
+    "Reminders": "views.reminders",
+    "Weather & Mood": "views.weather",
+    "Chat Support": "views.chat",
+    "Voice Assistant": "views.voice",
+    "Settings": "views.settings",
+}
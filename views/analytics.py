@@ -0,0 +1,44 @@
+"""
+Mood Analytics page: rolling averages, weekly means and mood distribution
+"""
+
+import pandas as pd
+import streamlit as st
+
+from mood_analytics import get_analytics
+
+
+def render(storage):
+    st.title("Mood Analytics")
+    st.write("Trends and patterns in your mood history.")
+    
+    analytics = get_analytics(storage)
+    
+    if analytics.count:
+        summary = analytics.summary()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Check-ins", summary["entries"])
+        col2.metric("7-day average", "-" if summary["avg_7d"] is None else f"{summary['avg_7d']:.2f}")
+        col3.metric("30-day average", "-" if summary["avg_30d"] is None else f"{summary['avg_30d']:.2f}")
+        col4.metric("Current streak", f"{summary['streak']} days")
+        
+        # Daily means with rolling averages
+        st.subheader("Daily Mood and Rolling Averages")
+        days = st.slider("Days to show:", min_value=14, max_value=365, value=90, step=7)
+        daily_df = pd.DataFrame(
+            analytics.daily_series(days),
+            columns=["date", "Daily mean", "7-day average", "30-day average"]
+        ).set_index("date")
+        st.line_chart(daily_df)
+        
+        # Weekly means
+        st.subheader("Weekly Averages")
+        weekly_df = pd.DataFrame(analytics.weekly_means(12), columns=["week", "Weekly mean"]).set_index("week")
+        st.bar_chart(weekly_df)
+        
+        # Distribution by mood category
+        st.subheader("Mood Distribution")
+        distribution = analytics.distribution()
+        st.bar_chart(pd.DataFrame({"Entries": list(distribution.values())}, index=list(distribution.keys())))
+    else:
+        st.write("No mood data recorded yet.")
@@ -0,0 +1,36 @@
+"""
+Guided Breathing page
+"""
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from breathing import ANIMATION_HEIGHT, get_techniques
+
+
+def render(storage):
+    st.title("Guided Breathing Exercise")
+    st.write("Take a moment to breathe and relax.")
+
+    try:
+        techniques = get_techniques()
+    except ValueError as error:
+        st.error(str(error))
+        return
+
+    selected_breathing = st.selectbox("Select breathing technique:", list(techniques.keys()))
+
+    # The selected technique is compiled once per process, so starting it is a lookup
+    technique = techniques[selected_breathing]
+
+    if st.button("Start Breathing Exercise"):
+        # The whole exercise is animated in the browser; the script returns immediately
+        st.session_state.breathing_count += 1
+
+        # The run number makes each start a new component, restarting the animation
+        components.html(f"<!-- run {st.session_state.breathing_count} -->{technique.html}", height=ANIMATION_HEIGHT)
+        minutes, seconds = divmod(technique.duration, 60)
+        st.caption(f"About {minutes} min {seconds} s. Follow the circle and the countdown.")
+
+        # Show statistics; the animation runs in the browser, so only starts can be counted
+        st.success(f"You have started {st.session_state.breathing_count} breathing exercises this session. Great job!")
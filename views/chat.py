@@ -0,0 +1,167 @@
+"""
+Chat Support page
+"""
+
+import random
+
+import streamlit as st
+
+from chat_client import OpenAIBackend, chat_stats
+from chat_context import ContextWindow
+from chat_history import append_message, list_conversations, message_count, new_conversation, recent_messages
+from intents import CRISIS_RESPONSE, is_sensitive, local_reply, remember_reply, reply_stats
+
+# Messages shown at once; older ones are loaded on demand
+PAGE_SIZE = 20
+
+# Messages of a resumed conversation loaded to rebuild the context window
+CONTEXT_MESSAGES = 100
+
+# Conversations offered in the selector
+LISTED_CONVERSATIONS = 20
+
+
+def open_conversation(storage, conv_id):
+    """Make conv_id (None for a new one) the session's current conversation"""
+    st.session_state.chat_conversation = conv_id
+    st.session_state.chat_loaded = (storage.user_id, conv_id)
+    st.session_state.message_history = recent_messages(storage, conv_id, CONTEXT_MESSAGES) if conv_id else []
+    # Older turns are summarized so each request stays within a fixed token budget
+    st.session_state.chat_context = ContextWindow()
+    st.session_state.chat_visible = PAGE_SIZE
+
+
+def add_message(storage, role, content):
+    """Save a message to the current conversation, starting one if needed"""
+    if st.session_state.chat_conversation is None:
+        conv_id = new_conversation(storage)
+        st.session_state.chat_conversation = conv_id
+        st.session_state.chat_loaded = (storage.user_id, conv_id)
+    append_message(storage, st.session_state.chat_conversation, role, content)
+    st.session_state.message_history.append({"role": role, "content": content})
+
+
+def show_earlier_messages():
+    st.session_state.chat_visible += PAGE_SIZE
+
+
+def render(storage):
+    st.title("Chat Support")
+    st.write("Talk to our AI companion about mental health concerns.")
+    
+    # API key input
+    openai_api_key = st.sidebar.text_input("Enter OpenAI API Key:", 
+                                         value=st.session_state.openai_api_key, 
+                                         type="password")
+    
+    if openai_api_key:
+        st.session_state.openai_api_key = openai_api_key
+    
+    # Resume the latest conversation of the profile, or switch to the chosen one
+    conversations = dict(list_conversations(storage, limit=LISTED_CONVERSATIONS))
+    if st.session_state.get("chat_loaded", (None, None))[0] != storage.user_id:
+        open_conversation(storage, next(iter(conversations), None))
+    
+    conv_options = [None] + list(conversations)
+    if st.session_state.chat_conversation not in conv_options:
+        conv_options.insert(1, st.session_state.chat_conversation)
+    selected_conversation = st.selectbox(
+        "Conversation:",
+        conv_options,
+        index=conv_options.index(st.session_state.chat_conversation),
+        format_func=lambda conv_id: (
+            "New conversation" if conv_id is None
+            else f"{conversations[conv_id]['title']} ({conversations[conv_id]['updated']})" if conv_id in conversations
+            else conv_id
+        )
+    )
+    if selected_conversation != st.session_state.chat_conversation:
+        open_conversation(storage, selected_conversation)
+    
+    # Display conversation history, loading only the latest page of messages
+    st.subheader("Conversation")
+    conv_id = st.session_state.chat_conversation
+    total_messages = message_count(storage, conv_id) if conv_id else 0
+    if total_messages > st.session_state.chat_visible:
+        st.button(f"Show earlier messages ({total_messages - st.session_state.chat_visible} more)",
+                  on_click=show_earlier_messages)
+    
+    for message in recent_messages(storage, conv_id, st.session_state.chat_visible) if conv_id else []:
+        if message["role"] == "user":
+            st.write(f"You: {message['content']}")
+        else:
+            st.write(f"AI: {message['content']}")
+
+    stats = chat_stats()
+    if stats["ttft_p50"] is not None:
+        st.caption(f"Replies start after {stats['ttft_p50'] * 1000:.0f} ms (median over {stats['requests']} requests)")
+    replies = reply_stats()
+    if replies["intents"]["hits"] + replies["cache"]["hits"]:
+        st.caption(
+            f"Answered locally: {replies['intents']['hits']} by intent "
+            f"({replies['intents']['hit_rate']:.0%} of messages), {replies['cache']['hits']} from cache "
+            f"({replies['cache']['hit_rate']:.0%} hit rate)"
+        )
+    
+    # User input
+    user_input = st.text_input("Type your message:", key="chat_input")
+    
+    if st.button("Send") and user_input:
+        # Add user message to history
+        add_message(storage, "user", user_input)
+        # The conversation before this message; cached replies are only used without one
+        context = st.session_state.message_history[:-1]
+        
+        try:
+            # Greetings, common questions and repeated opening messages are answered locally
+            local_response = local_reply(user_input, storage.user_id, context)
+            if local_response is not None:
+                add_message(storage, "assistant", local_response)
+            elif st.session_state.openai_api_key:
+                # Create system message for mental health focus
+                system_message = {
+                    "role": "system", 
+                    "content": "You are a supportive and compassionate mental health companion. Provide helpful guidance, support, and resources for mental wellness. Don't provide medical diagnoses or treatment advice."
+                }
+                
+                # Prepare messages for API call
+                messages = st.session_state.chat_context.build(system_message, st.session_state.message_history)
+                
+                # Stream the reply into the page as it is generated
+                reply_placeholder = st.empty()
+                assistant_response = ""
+                for token in OpenAIBackend(st.session_state.openai_api_key).stream(messages):
+                    assistant_response += token
+                    reply_placeholder.write(f"AI: {assistant_response}▌")
+                
+                # Add assistant response to history
+                add_message(storage, "assistant", assistant_response)
+                remember_reply(user_input, assistant_response, storage.user_id, context)
+            else:
+                # Fallback responses if no API key
+                fallback_responses = [
+                    "I'm here to listen. What's been on your mind lately?",
+                    "It sounds like you're going through a lot. Remember to be kind to yourself.",
+                    "Have you tried any breathing exercises when you feel this way?",
+                    "Acknowledging your feelings is an important step. What support do you need right now?",
+                    "Remember that it's okay to ask for help when you need it.",
+                    "Self-care is important. What's one small thing you could do for yourself today?",
+                    "I'm here to support you. Would you like to talk more about what you're experiencing?"
+                ]
+                
+                if is_sensitive(user_input):
+                    assistant_response = CRISIS_RESPONSE
+                else:
+                    assistant_response = random.choice(fallback_responses)
+                add_message(storage, "assistant", assistant_response)
+                
+                # Note about API key
+                st.info("For personalized responses, please add your OpenAI API key in the sidebar.")
+        
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+            # Keep the error on screen instead of rerunning past it
+            return
+        
+        # Rerun to update the conversation display
+        st.experimental_rerun()
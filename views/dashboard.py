@@ -0,0 +1,71 @@
+"""
+Dashboard page: latest entries, mood trends and quick actions
+"""
+
+import datetime
+
+import streamlit as st
+
+from mood_analytics import get_analytics
+from mood_data import MOOD_OPTIONS, MOOD_SCORES
+
+
+def render(storage):
+    st.title("Mental Health Companion Dashboard")
+    st.write("Welcome to your personal mental health companion!")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Your Latest Stats")
+        
+        # Recent journal entries
+        st.write("#### Recent Journal Entries")
+        recent_entries = storage.latest("journal_entries", 3)
+        if recent_entries:
+            for date, entry in recent_entries:
+                st.write(f"**{date}**: {entry[:100]}..." if len(entry) > 100 else f"**{date}**: {entry}")
+        else:
+            st.write("No journal entries yet.")
+        
+        # Recent mood entries
+        st.write("#### Recent Mood Entries")
+        recent_moods = storage.latest("mood_entries", 3)
+        if recent_moods:
+            for date, mood_data in recent_moods:
+                st.write(f"**{date}**: Mood - {mood_data['mood']}, Score - {mood_data['sentiment_score']:.2f}")
+            
+            # Incrementally maintained, so this costs the same for any history length
+            summary = get_analytics(storage).summary()
+            st.write("#### Mood Trends")
+            trend_cols = st.columns(3)
+            trend_cols[0].metric("7-day average", "-" if summary["avg_7d"] is None else f"{summary['avg_7d']:.2f}")
+            trend_cols[1].metric("30-day average", "-" if summary["avg_30d"] is None else f"{summary['avg_30d']:.2f}")
+            trend_cols[2].metric("Check-in streak", f"{summary['streak']} days")
+        else:
+            st.write("No mood entries yet.")
+    
+    with col2:
+        st.subheader("Quick Actions")
+        
+        # Quick breathing exercise
+        if st.button("Quick Breathing Exercise (2 minutes)"):
+            st.session_state.page = "Guided Breathing"
+            st.experimental_rerun()
+        
+        # Quick mood check-in
+        st.write("#### Quick Mood Check-in")
+        quick_mood = st.select_slider(
+            "How are you feeling right now?",
+            options=MOOD_OPTIONS
+        )
+        
+        if st.button("Save Quick Mood"):
+            today = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+            sentiment_score = MOOD_SCORES[quick_mood]
+            
+            storage.put("mood_entries", today, {
+                "mood": quick_mood,
+                "sentiment_score": sentiment_score
+            })
+            st.success("Mood saved successfully!")
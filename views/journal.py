@@ -0,0 +1,66 @@
+"""
+Daily Journal page
+"""
+
+import datetime
+import random
+
+import streamlit as st
+
+import sentiment
+
+
+def render(storage):
+    st.title("Daily Journal")
+    
+    # Journal prompts
+    journal_prompts = [
+        "What made you smile today?",
+        "What's something you're grateful for today?",
+        "What's one challenge you faced today and how did you handle it?",
+        "Describe one moment of joy you experienced today.",
+        "What's something you learned today?",
+        "What's one thing you're looking forward to tomorrow?",
+        "How did you take care of yourself today?",
+        "What's something you'd like to improve about tomorrow?",
+        "Who made a positive impact on your day and why?",
+        "What emotions were most present for you today?"
+    ]
+    
+    today = datetime.datetime.now().strftime("%Y-%m-%d")
+    
+    # Journal section
+    st.subheader("Today's Journal")
+    
+    # Show a random prompt
+    random_prompt = random.choice(journal_prompts)
+    st.write(f"**Prompt:** {random_prompt}")
+    
+    # Journal entry
+    journal_content = st.text_area("Your thoughts:", height=250, 
+                                   value=storage.get("journal_entries", today, ""))
+    
+    if st.button("Save Journal Entry"):
+        storage.put("journal_entries", today, journal_content)
+        sentiment.score_journal_entry(storage, today, journal_content)
+        st.success("Journal entry saved successfully!")
+    
+    # Show past entries
+    st.subheader("Past Journal Entries")
+    journal_dates = storage.keys("journal_entries", reverse=True)
+    if journal_dates:
+        selected_date = st.selectbox("Select a date:", journal_dates)
+        
+        st.write(storage.get("journal_entries", selected_date, ""))
+        
+        journal_sentiment = storage.get(sentiment.JOURNAL_SENTIMENT_STORE, selected_date)
+        if journal_sentiment is not None:
+            st.caption(f"Sentiment score: {journal_sentiment['score']:.2f}")
+        
+        if st.button("Delete this entry"):
+            storage.delete("journal_entries", selected_date)
+            storage.delete(sentiment.JOURNAL_SENTIMENT_STORE, selected_date)
+            st.success("Journal entry deleted.")
+            st.experimental_rerun()
+    else:
+        st.write("No journal entries yet.")
@@ -0,0 +1,89 @@
+"""
+Mood Tracker page: mood check-in, history chart and mood log
+"""
+
+import datetime
+
+import streamlit as st
+
+import mood_chart
+import sentiment
+from mood_data import MOOD_OPTIONS, MOOD_SCORES, mood_frame_since
+from weather import get_weather
+from weather_mood import weather_fields
+
+
+def render(storage):
+    st.title("Mood Tracker")
+    st.write("Track your mood and see patterns over time.")
+    
+    # Current mood input
+    st.subheader("How are you feeling today?")
+    
+    selected_mood = st.select_slider(
+        "Select your mood:",
+        options=MOOD_OPTIONS
+    )
+    
+    notes = st.text_area("Notes about your mood (optional):", height=100)
+    
+    if st.button("Save Mood"):
+        # Get current date and time
+        now = datetime.datetime.now()
+        date_key = now.strftime("%Y-%m-%d %H:%M")
+        
+        # Perform sentiment analysis on notes
+        if notes:
+            sentiment_score = sentiment.score(notes)
+        else:
+            # If no notes, use a predetermined sentiment score based on selected mood
+            sentiment_score = MOOD_SCORES[selected_mood]
+        
+        mood_entry = {
+            "mood": selected_mood,
+            "notes": notes,
+            "sentiment_score": sentiment_score
+        }
+        
+        # Keep the current weather with the entry when it is already known (never waits)
+        if st.session_state.weather_api_key and st.session_state.city:
+            weather = get_weather(st.session_state.city, st.session_state.weather_api_key, wait=False)
+            if weather:
+                mood_entry["weather"] = weather_fields(weather)
+        
+        # Save mood data
+        storage.put("mood_entries", date_key, mood_entry)
+        st.success("Mood saved successfully!")
+    
+    # Display mood history
+    st.subheader("Mood History")
+    
+    history_ranges = {
+        "Last 7 days": 7,
+        "Last 30 days": 30,
+        "Last 90 days": 90,
+        "Last year": 365,
+        "All time": None
+    }
+    history_range = st.selectbox("Show:", list(history_ranges.keys()), index=1)
+    
+    # Only the selected date range is read from storage; day granularity keeps
+    # the cached frame and chart valid for the whole day
+    days = history_ranges[history_range]
+    start = None
+    if days is not None:
+        start = (datetime.date.today() - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
+    mood_df = mood_frame_since(storage, st.session_state.user_id, start)
+    
+    if not mood_df.empty:
+        # Display the plot (cached until an entry is added or deleted)
+        st.image(mood_chart.mood_chart_png(storage, st.session_state.user_id, start))
+        
+        # Show tabular data
+        st.subheader("Mood Log")
+        display_df = mood_df.iloc[::-1]
+        display_df = display_df.set_index(display_df.index.strftime("%Y-%m-%d %H:%M"))
+        st.dataframe(display_df.rename(columns={"sentiment_score": "score"}))
+        
+    else:
+        st.write("No mood data recorded yet.")
@@ -0,0 +1,80 @@
+"""
+Reminders page
+"""
+
+import datetime
+
+import streamlit as st
+
+from reminders import (
+    REMINDER_TYPES, SCHEDULER_MODE, WEEKDAYS, add_reminder, delete_reminder, todays_reminders, user_reminders,
+)
+
+
+def render(storage):
+    st.title("Daily Reminders")
+    st.write("""
+    Set reminders for the habits that help you feel well.
+    They are kept on the server and fire on schedule even when this page is closed.
+    """)
+
+    # Set up reminders
+    st.subheader("Set Reminders")
+
+    selected_reminder = st.selectbox("Reminder type:", list(REMINDER_TYPES), format_func=REMINDER_TYPES.get)
+    reminder_time = st.time_input("Set time:", datetime.time(8, 0))
+    reminder_days = st.multiselect(
+        "Select days:",
+        WEEKDAYS,
+        default=WEEKDAYS[:5]
+    )
+
+    reminder_note = st.text_input("Additional note (optional):")
+
+    if st.button("Set Reminder"):
+        if not reminder_days:
+            st.error("Please select at least one day.")
+        else:
+            add_reminder(storage.user_id, selected_reminder, reminder_time,
+                         [WEEKDAYS.index(day) for day in reminder_days], reminder_note)
+            st.success(f"Reminder set for {reminder_time.strftime('%H:%M')} on {', '.join(reminder_days)}!")
+
+    if SCHEDULER_MODE != "app":
+        st.caption("Reminders are sent by the reminder service (python reminders.py run).")
+
+    # Reminders due today, with whether they have fired yet
+    st.subheader("Today's Reminders")
+
+    now = datetime.datetime.now()
+    todays = todays_reminders(storage.user_id, now)
+
+    if not todays:
+        st.info("No reminders today.")
+
+    for key, reminder, fired in todays:
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            st.write(f"**{REMINDER_TYPES[reminder['type']]}**")
+            if reminder['note']:
+                st.caption(reminder['note'])
+        with col2:
+            st.write(reminder['time'])
+        with col3:
+            if fired:
+                st.write("✅ Sent")
+            elif reminder['time'] < now.strftime("%H:%M"):
+                st.write("⚠️ Missed")
+            else:
+                st.write("⏳ Upcoming")
+
+    # Every reminder of this profile
+    all_reminders = user_reminders(storage.user_id)
+    if all_reminders:
+        with st.expander(f"All reminders ({len(all_reminders)})"):
+            for key, reminder in all_reminders:
+                col1, col2 = st.columns([5, 1])
+                with col1:
+                    days = ", ".join(WEEKDAYS[day][:3] for day in reminder['days'])
+                    st.write(f"**{REMINDER_TYPES[reminder['type']]}** at {reminder['time']} on {days}")
+                with col2:
+                    st.button("Delete", key=f"delete_{key}", on_click=delete_reminder, args=(key,))
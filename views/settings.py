@@ -0,0 +1,155 @@
+"""
+Settings page: API keys, data management and preferences
+"""
+
+import streamlit as st
+
+import chat_history
+import export
+import importer
+import notifications
+import reminders
+import sentiment
+
+
+def render(storage):
+    st.title("Settings")
+    
+    # API Keys
+    st.subheader("API Keys")
+    
+    openai_api_key = st.text_input("OpenAI API Key:", 
+                                  value=st.session_state.openai_api_key, 
+                                  type="password")
+    
+    weather_api_key = st.text_input("OpenWeatherMap API Key:", 
+                                   value=st.session_state.weather_api_key, 
+                                   type="password")
+    
+    if st.button("Save API Keys"):
+        st.session_state.openai_api_key = openai_api_key
+        st.session_state.weather_api_key = weather_api_key
+        st.success("API keys saved!")
+    
+    # Data Management
+    st.subheader("Data Management")
+    
+    # Exports are streamed from storage, so their size is not limited by memory
+    with st.expander("Export options"):
+        export_format = st.selectbox("Format:", list(export.FORMATS), format_func=str.upper)
+        compressions = export.available_compressions()
+        export_compression = st.selectbox("Compression:", compressions, index=compressions.index("gzip"))
+        export_stores = st.multiselect("Include:", list(export.EXPORT_STORES), default=list(export.EXPORT_STORES),
+                                       format_func=lambda store: store.replace("_", " ").capitalize())
+        export_range = st.date_input("Date range (optional):", value=())
+    
+    if st.button("Export Data"):
+        since, until = (list(export_range) + [None, None])[:2] if export_range else (None, None)
+        export_data = export.export_file(storage, stores=export_stores, fmt=export_format,
+                                         compression=export_compression, since=since, until=until or since)
+        
+        # Create download button; Streamlit keeps the (compressed) file in memory to serve it
+        st.download_button(
+            label=f"Download {export_format.upper()}",
+            data=export_data.read(),
+            file_name=export.file_name(export_format, export_compression, storage.user_id),
+            mime=export.mime_type(export_format, export_compression)
+        )
+        export_data.close()
+    
+    # Import an export of this app (e.g. from another instance) or a mood CSV from another app
+    import_upload = st.file_uploader("Import data:", type=["ndjson", "jsonl", "json", "csv", "gz", "zst"],
+                                     help="An export of this app, or a CSV with date, mood and note columns")
+    import_overwrite = st.checkbox("Replace entries that already exist", value=False)
+    
+    if import_upload is not None and st.button("Import Data"):
+        try:
+            # Scored in this process: forking worker processes from the Streamlit server is unsafe
+            report = importer.import_file(storage, import_upload, overwrite=import_overwrite, workers=1)
+        except importer.ImportFileError as error:
+            st.error(str(error))
+        else:
+            st.success(report.summary())
+            if report.errors:
+                st.caption("\n\n".join(report.errors))
+    
+    cache_stats = storage.cache_stats()
+    if cache_stats is not None:
+        st.caption(f"Storage cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    
+    if st.button("Clear All Data"):
+        st.warning("⚠️ This will delete all your journal entries, mood data and chat history. This action cannot be undone.")
+        confirm = st.checkbox("I understand and want to clear all data")
+        
+        if confirm and st.button("Confirm Clear Data"):
+            storage.clear("journal_entries")
+            storage.clear(sentiment.JOURNAL_SENTIMENT_STORE)
+            storage.clear("mood_entries")
+            storage.clear(chat_history.CONVERSATIONS_STORE)
+            storage.clear(chat_history.MESSAGES_STORE)
+            storage.clear(notifications.INBOX_STORE)
+            for key, _ in reminders.user_reminders(storage.user_id):
+                reminders.delete_reminder(key)
+            st.success("All data cleared successfully.")
+            st.experimental_rerun()
+    
+    # Notification Settings
+    st.subheader("Notification Settings")
+    
+    # Preferences are saved as soon as they change; the notification dispatcher reads them
+    preferences = notifications.get_preferences(storage)
+    updated = dict(preferences)
+    updated["enabled"] = st.checkbox("Enable notifications", value=preferences["enabled"])
+    
+    if updated["enabled"]:
+        st.write("Notification types:")
+        
+        categories = list(notifications.CATEGORIES.items())
+        col1, col2 = st.columns(2)
+        
+        for column, half in ((col1, categories[:3]), (col2, categories[3:])):
+            with column:
+                for category, label in half:
+                    updated[category] = st.checkbox(label, value=preferences[category])
+    
+    if updated != preferences:
+        notifications.save_preferences(storage, updated)
+    
+    delivery = notifications.dispatcher.stats()
+    if delivery["sent"] or delivery["queued"]:
+        st.caption(f"Notifications: {delivery['sent']} sent, {delivery['queued']} queued, "
+                   f"{delivery['coalesced']} merged, {delivery['dropped']} dropped")
+    
+    # Theme Settings
+    st.subheader("Theme Settings")
+    
+    theme = st.radio("Select theme:", ["Light", "Dark", "System Default"])
+    color_scheme = st.selectbox("Color scheme:", ["Blue", "Green", "Purple", "Warm"])
+    
+    if st.button("Save Settings"):
+        st.success("Settings saved successfully!")
+        
+    # About
+    st.subheader("About Mental Health Companion")
+    st.write("""
+    Mental Health Companion is a comprehensive tool designed to support your mental wellness journey.
+    
+    **Features:**
+    - Guided breathing exercises
+    - Daily journaling
+    - Mood tracking with sentiment analysis
+    - Weather and mood correlation
+    - AI chat support
+    - Voice assistant
+    
+    **Version:** 1.0.0
+    
+    This application stores all your data locally and does not send any personal information
+    to external servers (except when using the API services you've configured).
+    """)
+    
+    # Contact
+    st.subheader("Help & Support")
+    st.write("If you have any questions or need assistance, please contact us:")
+    st.write("Email: support@mentalhealthcompanion.example.com")
+    st.write("Website: [mentalhealthcompanion.example.com](https://mentalhealthcompanion.example.com)")
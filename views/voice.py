@@ -0,0 +1,102 @@
+"""
+Voice Assistant page: speech-to-text and text-to-speech
+"""
+
+import speech_recognition as sr
+import streamlit as st
+
+from intents import DEFAULT_RESPONSE, RESPONSES, intent_response
+from speech import AUDIO_TYPES, DEFAULT_ENGINE, ENGINES, SpeechError, listen, read_audio_file, transcribe
+from tts import DEFAULT_RATE, SpeechSynthesisError, prefetch, synthesize
+
+
+def play(audio_file):
+    with open(audio_file, "rb") as f:
+        st.audio(f.read(), format="audio/wav")
+
+
+def render(storage):
+    st.title("Voice Assistant")
+    st.write("Talk to your mental health companion using voice.")
+    
+    # The canned responses are synthesized in the background, so speaking them is instant
+    tts_rate = st.session_state.get("tts_rate", DEFAULT_RATE)
+    if st.session_state.get("tts_prefetched") != tts_rate:
+        prefetch(list(RESPONSES.values()) + [DEFAULT_RESPONSE], rate=tts_rate)
+        st.session_state.tts_prefetched = tts_rate
+    
+    # Voice input
+    st.subheader("Voice Input")
+    
+    engine = st.selectbox(
+        "Speech recognition:",
+        list(ENGINES.keys()),
+        index=list(ENGINES.keys()).index(DEFAULT_ENGINE) if DEFAULT_ENGINE in ENGINES else 0,
+        format_func=lambda name: ENGINES[name][0]
+    )
+    source = st.radio("Input:", ["Microphone", "Audio file"], horizontal=True)
+    
+    audio = None
+    if source == "Microphone":
+        st.write("Click the button and speak to convert your speech to text.")
+        
+        if st.button("Start Listening"):
+            with st.spinner("Listening..."):
+                try:
+                    # Ambient noise is measured once per session and reused
+                    audio, st.session_state.stt_energy_threshold = listen(
+                        st.session_state.get("stt_energy_threshold")
+                    )
+                except sr.WaitTimeoutError:
+                    st.error("No speech detected. Please try again.")
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+    else:
+        uploaded_audio = st.file_uploader("Upload a recording:", type=AUDIO_TYPES)
+        if uploaded_audio is not None and st.button("Transcribe"):
+            try:
+                audio = read_audio_file(uploaded_audio)
+            except SpeechError as e:
+                st.error(str(e))
+    
+    if audio is not None:
+        with st.spinner("Processing speech..."):
+            try:
+                text = transcribe(audio, engine)
+            except SpeechError as e:
+                st.error(str(e))
+                text = None
+        
+        if text:
+            st.success(f"You said: {text}")
+            
+            # Process the speech input
+            # This would typically call the chatbot function
+            # For demo purposes, we'll use a simple response system
+            
+            response_text = intent_response(text)
+            
+            # Use text-to-speech to respond
+            st.subheader("Response")
+            st.write(response_text)
+            
+            try:
+                play(synthesize(response_text, rate=tts_rate))
+            except SpeechSynthesisError as e:
+                st.info(f"The response could not be spoken: {str(e)}")
+    
+    # Text-to-speech demo
+    st.subheader("Text-to-Speech")
+    tts_text = st.text_area("Enter text to convert to speech:", "Hello, I'm your mental health companion.")
+    
+    st.slider("Speaking rate (words per minute):", 100, 250, DEFAULT_RATE, step=25, key="tts_rate")
+    
+    if st.button("Convert to Speech"):
+        try:
+            with st.spinner("Synthesizing speech..."):
+                audio_file = synthesize(tts_text, rate=st.session_state.tts_rate)
+        except SpeechSynthesisError as e:
+            st.error(str(e))
+        else:
+            st.success("Text converted to speech!")
+            play(audio_file)
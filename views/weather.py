@@ -0,0 +1,90 @@
+"""
+Weather & Mood page
+"""
+
+import pandas as pd
+import streamlit as st
+
+from weather import WeatherError, get_weather, icon_path
+from weather_mood import MIN_SAMPLES, get_weather_mood
+
+
+def render(storage):
+    st.title("Weather & Mood Correlation")
+    
+    # Weather API setup
+    st.subheader("Weather Information")
+    
+    # API key input
+    weather_api_key = st.text_input("Enter OpenWeatherMap API Key:", 
+                              value=st.session_state.weather_api_key, 
+                              type="password")
+    
+    if weather_api_key:
+        st.session_state.weather_api_key = weather_api_key
+    
+    # City input
+    city = st.text_input("Enter your city:", value=st.session_state.city)
+    if city:
+        st.session_state.city = city
+    
+    # Get weather data; once a city has been looked up it is shown from the cache
+    # on every visit, refreshed in the background
+    weather = None
+    if st.button("Get Weather Data"):
+        if not st.session_state.weather_api_key:
+            st.error("Please enter an OpenWeatherMap API key to get weather data.")
+        else:
+            try:
+                weather = get_weather(city, st.session_state.weather_api_key)
+            except WeatherError as e:
+                st.error(f"Error fetching weather data: {str(e)}")
+    elif city and st.session_state.weather_api_key:
+        weather = get_weather(city, st.session_state.weather_api_key, wait=False)
+    
+    if weather:
+        # Display current weather
+        st.subheader(f"Current Weather in {weather['city']}")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write(f"**Temperature:** {weather['temp']}°C")
+            st.write(f"**Feels Like:** {weather['feels_like']}°C")
+            st.write(f"**Humidity:** {weather['humidity']}%")
+            
+        with col2:
+            st.write(f"**Condition:** {weather['description'].capitalize()}")
+            
+            icon_file = icon_path(weather['icon'])
+            if icon_file:
+                st.image(icon_file, width=100)
+    
+    # Correlation of the recorded moods with the weather they were saved in
+    if storage.count("mood_entries"):
+        st.subheader("Weather-Mood Correlation")
+        stats = get_weather_mood(storage)
+        
+        if stats.samples < MIN_SAMPLES:
+            st.write(f"{stats.samples} of your mood entries have weather data; at least {MIN_SAMPLES} are needed.")
+            st.write("Moods saved while the weather for your city is known are matched with it automatically. "
+                     "Older entries can be matched with historical weather by running "
+                     "`python weather_mood.py backfill <weather.csv>`.")
+        else:
+            st.write(f"Based on {stats.samples} mood entries with weather data:")
+            for insight in stats.insights():
+                st.write(f"• {insight}")
+            
+            col1, col2 = st.columns(2)
+            for col, variable, label in ((col1, "temp", "Temperature"), (col2, "humidity", "Humidity")):
+                r = stats.correlation(variable)
+                col.metric(f"{label} vs. mood (r)", "n/a" if r is None else f"{r:.2f}")
+            
+            condition_means = stats.condition_means()
+            if condition_means:
+                st.write("##### Average mood score by condition")
+                condition_df = pd.DataFrame(condition_means, columns=["Condition", "Average score", "Entries"])
+                st.bar_chart(condition_df.set_index("Condition")["Average score"])
+    
+    if not storage.count("mood_entries"):
+        st.info("Record mood data to see weather correlations.")
@@ -0,0 +1,188 @@
+"""
+OpenWeatherMap client for the Weather & Mood page
+
+Observations are cached per city for WEATHER_TTL seconds and served from the
+cache for up to STALE_TTL while a background thread refreshes them, so only
+the first lookup of a city waits for the network. The refresher also keeps
+the cities viewed in the last ACTIVE_WINDOW seconds warm. Condition icons are
+downloaded once into a cache directory and served from disk.
+
+All requests share a pooled session and have explicit timeouts. Set
+MHC_WEATHER_BASE_URL and MHC_WEATHER_ICON_URL to use another endpoint, for
+example the stub in benchmarks/mock_weather.py.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+
+import requests
+
+from caching import LRUCache
+from http_client import get_session
+from storage import DATA_DIR
+from storage.atomic import atomic_write
+
+WEATHER_BASE_URL = os.environ.get("MHC_WEATHER_BASE_URL", "https://api.openweathermap.org/data/2.5")
+WEATHER_ICON_URL = os.environ.get("MHC_WEATHER_ICON_URL", "https://openweathermap.org/img/wn")
+
+# (connect, read) timeouts in seconds
+TIMEOUT = (3, 5)
+
+# Observations younger than this are served without a refresh
+WEATHER_TTL = 600
+# Older observations are still served, while a refresh runs, up to this age
+STALE_TTL = 3 * 3600
+
+# How often the refresher looks for observations about to expire
+REFRESH_INTERVAL = 60
+# Cities nobody looked at for this long are no longer refreshed
+ACTIVE_WINDOW = 1800
+
+ICON_DIR = os.path.join(DATA_DIR, "cache", "weather_icons")
+
+logger = logging.getLogger(__name__)
+
+_ICON_CODE = re.compile(r"^[0-9]{2}[dn]$")
+
+_observations = LRUCache(maxsize=256, ttl=STALE_TTL)
+
+
+class WeatherError(Exception):
+    """A weather lookup failed; the message is safe to show to the user"""
+
+
+def city_key(city):
+    return " ".join(city.lower().split())
+
+
+def fetch_weather(city, api_key):
+    """Request the current weather of a city and return it as an observation dict"""
+    try:
+        response = get_session("weather").get(
+            f"{WEATHER_BASE_URL}/weather",
+            params={"q": city, "appid": api_key, "units": "metric"},
+            timeout=TIMEOUT,
+        )
+        data = response.json()
+    except (requests.RequestException, ValueError) as error:
+        raise WeatherError(f"Could not reach the weather service: {error}") from error
+    if response.status_code != 200:
+        raise WeatherError(data.get("message", response.reason) if isinstance(data, dict) else response.reason)
+
+    try:
+        return {
+            "city": data.get("name") or city,
+            "temp": float(data["main"]["temp"]),
+            "feels_like": float(data["main"]["feels_like"]),
+            "humidity": float(data["main"]["humidity"]),
+            "condition": str(data["weather"][0]["main"]),
+            "description": str(data["weather"][0]["description"]),
+            "icon": str(data["weather"][0]["icon"]),
+            "fetched": time.time(),
+        }
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError) as error:
+        raise WeatherError("The weather service sent an unexpected response.") from error
+
+
+def get_weather(city, api_key, wait=True):
+    """Return the current weather of a city
+
+    Cached observations are returned straight away, refreshing them in the
+    background when they are older than WEATHER_TTL. Otherwise the weather is
+    fetched, unless wait is False, in which case a background fetch is queued
+    and None is returned.
+    """
+    key = city_key(city)
+    refresher.track(key, city, api_key)
+    observation = _observations.get(key)
+    if observation is not None:
+        if time.time() - observation["fetched"] > WEATHER_TTL:
+            refresher.request(key)
+        return observation
+    if not wait:
+        refresher.request(key)  # So the next lookup finds it
+        return None
+    observation = fetch_weather(city, api_key)
+    _observations.set(key, observation)
+    return observation
+
+
+def icon_path(icon):
+    """Return the local file of a condition icon, downloading it once; None if unavailable"""
+    if not _ICON_CODE.match(icon or ""):
+        return None
+    path = os.path.join(ICON_DIR, f"{icon}@2x.png")
+    if os.path.exists(path):
+        return path
+    try:
+        response = get_session("weather").get(f"{WEATHER_ICON_URL}/{icon}@2x.png", timeout=TIMEOUT)
+    except requests.RequestException:
+        return None
+    if response.status_code != 200 or not response.content:
+        return None
+    try:
+        atomic_write(path, response.content, keep_backup=False)
+    except OSError:
+        logger.warning("Could not save weather icon %s", path, exc_info=True)
+        return None
+    return path
+
+
+class WeatherRefresher:
+    """Background thread keeping the observations of recently viewed cities fresh"""
+
+    def __init__(self, interval=REFRESH_INTERVAL):
+        self.interval = interval
+        self._active = {}  # city key -> (city, api key, last viewed)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def track(self, key, city, api_key):
+        with self._lock:
+            self._active[key] = (city, api_key, time.time())
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="weather-refresher", daemon=True)
+                self._thread.start()
+
+    def request(self, key):
+        """Refresh a city as soon as possible"""
+        with self._lock:
+            self._pending.add(key)
+        self._wake.set()
+
+    def _due(self):
+        now = time.time()
+        due = []
+        with self._lock:
+            for key, (city, api_key, viewed) in list(self._active.items()):
+                if now - viewed > ACTIVE_WINDOW:
+                    del self._active[key]
+                    continue
+                observation = _observations.get(key)
+                expiring = observation is not None and now - observation["fetched"] > WEATHER_TTL - self.interval
+                if key in self._pending or expiring:
+                    due.append((key, city, api_key))
+            self._pending.clear()
+        return due
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            for key, city, api_key in self._due():
+                try:
+                    observation = fetch_weather(city, api_key)
+                    _observations.set(key, observation)
+                    icon_path(observation["icon"])
+                except WeatherError:
+                    continue  # Keep serving the previous observation
+                except Exception:  # Anything else must not end the refresher for good
+                    logger.exception("Refreshing the weather of %s failed", city)
+
+
+refresher = WeatherRefresher()
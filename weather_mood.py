@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Weather and mood correlation
+
+Mood entries carry the weather observed when they were saved under "weather"
+(temperature, humidity and condition); older entries can be matched with a
+historical daily weather CSV by running `python weather_mood.py backfill`.
+
+Correlations of temperature and humidity with the sentiment score, and the
+mean score per condition, are computed from running sums. The sums are built
+once per user with NumPy and then kept up to date by a storage listener, so
+the Weather & Mood page never rescans a long history.
+"""
+
+import argparse
+import math
+import sys
+import threading
+
+from caching import EngineCache
+from storage import DEFAULT_USER, get_storage, list_users, subscribe
+
+# Numeric weather fields correlated with the sentiment score
+VARIABLES = ("temp", "humidity")
+
+# Correlations over fewer entries are not reported
+MIN_SAMPLES = 5
+
+# |r| below this is reported as no clear link
+WEAK_CORRELATION = 0.1
+
+# Wording of the findings
+VARIABLE_LABELS = {"temp": ("temperature", "warmer", "colder"), "humidity": ("humidity", "more humid", "drier")}
+CONDITION_LABELS = {
+    "Clear": "clear", "Clouds": "cloudy", "Rain": "rainy", "Drizzle": "drizzly", "Snow": "snowy",
+    "Thunderstorm": "stormy", "Mist": "misty", "Fog": "foggy", "Haze": "hazy",
+}
+
+
+def weather_fields(observation):
+    """The part of a weather observation stored with a mood entry"""
+    return {
+        "temp": float(observation["temp"]),
+        "humidity": float(observation["humidity"]),
+        "condition": observation["condition"],
+    }
+
+
+class WeatherMoodStats:
+    """Running sums relating one user's sentiment scores to the weather"""
+
+    def __init__(self, version=None):
+        self.version = version
+        # variable -> [n, sum x, sum y, sum x^2, sum y^2, sum xy]
+        self.sums = {variable: [0, 0.0, 0.0, 0.0, 0.0, 0.0] for variable in VARIABLES}
+        # condition -> [score sum, count]
+        self.conditions = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_entries(cls, mood_history, version=None):
+        """Build the sums from (date key, entry) pairs with vectorized NumPy reductions"""
+        import numpy as np
+
+        engine = cls(version)
+        rows = [entry for _, entry in mood_history if entry.get("weather")]
+        if not rows:
+            return engine
+
+        scores = np.fromiter((entry["sentiment_score"] for entry in rows), dtype=np.float64, count=len(rows))
+        for variable in VARIABLES:
+            x = np.fromiter((entry["weather"][variable] for entry in rows), dtype=np.float64, count=len(rows))
+            engine.sums[variable] = [
+                len(rows), float(x.sum()), float(scores.sum()),
+                float(x @ x), float(scores @ scores), float(x @ scores),
+            ]
+
+        names, codes = np.unique([entry["weather"]["condition"] for entry in rows], return_inverse=True)
+        totals = np.bincount(codes, weights=scores)
+        counts = np.bincount(codes)
+        engine.conditions = {
+            str(name): [float(total), int(count)] for name, total, count in zip(names, totals, counts)
+        }
+        return engine
+
+    def apply(self, key, old, new):
+        """Replace the contribution of entry `key` (old value) with its new value"""
+        with self._lock:
+            if old is not None and old.get("weather"):
+                self._add(old, -1)
+            if new is not None and new.get("weather"):
+                self._add(new, 1)
+
+    def _add(self, entry, sign):
+        y = float(entry["sentiment_score"])
+        weather = entry["weather"]
+        for variable in VARIABLES:
+            x = float(weather[variable])
+            sums = self.sums[variable]
+            sums[0] += sign
+            sums[1] += sign * x
+            sums[2] += sign * y
+            sums[3] += sign * x * x
+            sums[4] += sign * y * y
+            sums[5] += sign * x * y
+        bucket = self.conditions.setdefault(weather["condition"], [0.0, 0])
+        bucket[0] += sign * y
+        bucket[1] += sign
+        if bucket[1] <= 0:
+            del self.conditions[weather["condition"]]
+
+    # Statistics
+
+    @property
+    def samples(self):
+        return self.sums[VARIABLES[0]][0]
+
+    def correlation(self, variable):
+        """Pearson correlation of a weather variable with the sentiment score, or None"""
+        with self._lock:
+            n, sx, sy, sxx, syy, sxy = self.sums[variable]
+        if n < MIN_SAMPLES:
+            return None
+        spread = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        if spread <= 1e-12:
+            return None
+        return max(-1.0, min(1.0, (n * sxy - sx * sy) / math.sqrt(spread)))
+
+    def condition_means(self):
+        """Return (condition, mean score, entries) tuples, best mood first"""
+        with self._lock:
+            means = [(condition, total / count, count) for condition, (total, count) in self.conditions.items()]
+        return sorted(means, key=lambda item: item[1], reverse=True)
+
+    def insights(self):
+        """Plain-language findings for the page"""
+        findings = []
+        for variable in VARIABLES:
+            r = self.correlation(variable)
+            if r is None:
+                continue
+            name, higher, lower = VARIABLE_LABELS[variable]
+            if abs(r) < WEAK_CORRELATION:
+                findings.append(f"No clear link between {name} and your mood")
+            else:
+                findings.append(f"Your mood tends to be higher when it is {higher if r > 0 else lower} (r = {r:.2f})")
+
+        means = [item for item in self.condition_means() if item[2] >= MIN_SAMPLES]
+        if len(means) >= 2:
+            best, best_mean, _ = means[0]
+            worst, worst_mean, _ = means[-1]
+            findings.append(f"Your best days are {CONDITION_LABELS.get(best, best.lower())} ones "
+                            f"(average score {best_mean:.2f})")
+            findings.append(f"Your mood is lowest on {CONDITION_LABELS.get(worst, worst.lower())} days "
+                            f"(average score {worst_mean:.2f})")
+        return findings
+
+
+_engines = EngineCache("mood_entries", WeatherMoodStats.from_entries)
+subscribe(_engines.on_change)
+
+
+def get_weather_mood(storage):
+    """Return the weather/mood statistics of the storage's user, rebuilding them only if out of date"""
+    return _engines.get(storage)
+
+
+# Backfill
+
+def load_history(path):
+    """Read a daily weather CSV (date, temp, humidity, condition) into {day: weather}"""
+    import pandas as pd
+
+    frame = pd.read_csv(path, usecols=["date", "temp", "humidity", "condition"])
+    frame = frame.dropna()
+    days = pd.to_datetime(frame["date"]).dt.strftime("%Y-%m-%d")
+    return {
+        day: {"temp": float(temp), "humidity": float(humidity), "condition": str(condition)}
+        for day, temp, humidity, condition in zip(days, frame["temp"], frame["humidity"], frame["condition"])
+    }
+
+
+def backfill(storage, history, overwrite=False):
+    """Attach the day's weather to every mood entry without one; return the number updated"""
+    updated = 0
+    for key, entry in storage.query("mood_entries"):
+        if entry.get("weather") and not overwrite:
+            continue
+        weather = history.get(key[:10])
+        if weather is None:
+            continue
+        storage.put("mood_entries", key, dict(entry, weather=weather))
+        updated += 1
+    return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Weather and mood correlation for Mental Health Companion Bot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = commands.add_parser("backfill", help="match mood entries with historical daily weather")
+    backfill_parser.add_argument("file", help="CSV with date, temp, humidity and condition columns")
+    backfill_parser.add_argument("--user", default=DEFAULT_USER, help="user id (default: %(default)s)")
+    backfill_parser.add_argument("--all-users", action="store_true", help="backfill every user")
+    backfill_parser.add_argument("--overwrite", action="store_true", help="replace weather already stored")
+    args = parser.parse_args(argv)
+
+    history = load_history(args.file)
+    users = list_users() if args.all_users else [args.user]
+    for user_id in users:
+        updated = backfill(get_storage(user_id), history, args.overwrite)
+        print(f"{user_id}: added weather to {updated} mood entries")
+
+
+if __name__ == "__main__":
+    sys.exit(main())